@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
 from typing import Iterable, Optional
@@ -8,7 +8,7 @@ from typing import Iterable, Optional
 ZERO = Decimal("0")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Transaction:
     amount: Decimal
     type: str
@@ -18,7 +18,7 @@ class Transaction:
     account_id: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BudgetRule:
     rule_type: str
     amount: Decimal
@@ -26,13 +26,55 @@ class BudgetRule:
     account_id: Optional[int] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BudgetEvaluation:
     current_value: Decimal
     remaining: Decimal
     status: str
 
 
+@dataclass(slots=True)
+class BudgetTotals:
+    income: Decimal = ZERO
+    expenses: Decimal = ZERO
+    expenses_by_category: dict[str, Decimal] = field(default_factory=dict)
+    expenses_by_account: dict[int, Decimal] = field(default_factory=dict)
+
+    def add(
+        self,
+        txn_type: str,
+        amount: Decimal,
+        category: Optional[str] = None,
+        account_id: Optional[int] = None,
+    ) -> None:
+        normalized_type = txn_type.strip().lower()
+        if normalized_type == "income":
+            self.income += _coerce_amount(amount)
+        elif normalized_type == "expense":
+            amount = _coerce_amount(amount)
+            self.expenses += amount
+            if category is not None:
+                self.expenses_by_category[category] = (
+                    self.expenses_by_category.get(category, ZERO) + amount
+                )
+            if account_id is not None:
+                self.expenses_by_account[account_id] = (
+                    self.expenses_by_account.get(account_id, ZERO) + amount
+                )
+
+
+def summarize_transactions(
+    transactions: Iterable[Transaction],
+    start_date: date,
+    end_date: date,
+) -> BudgetTotals:
+    totals = BudgetTotals()
+    for txn in transactions:
+        if start_date <= txn.date <= end_date:
+            totals.add(txn.type, txn.amount, txn.category, txn.account_id)
+    return totals
+
+
 def evaluate_budget(
     transactions: Iterable[Transaction],
     rule: BudgetRule,
@@ -41,38 +83,31 @@ def evaluate_budget(
 ) -> BudgetEvaluation:
     if start_date > end_date:
         raise ValueError("start_date must be on or before end_date.")
+    return evaluate_budget_totals(
+        summarize_transactions(transactions, start_date, end_date),
+        rule,
+    )
+
+
+def evaluate_budget_totals(totals: BudgetTotals, rule: BudgetRule) -> BudgetEvaluation:
     if rule.amount <= ZERO:
         raise ValueError("rule.amount must be greater than zero.")
 
     rule_type = rule.rule_type.strip().lower()
-    filtered = [
-        txn
-        for txn in transactions
-        if start_date <= txn.date <= end_date
-    ]
-
     if rule_type == "category_cap":
         if not rule.category:
             raise ValueError("category_cap requires a category.")
-        current_value = _sum_expenses(
-            filtered,
-            category=rule.category,
-        )
+        current_value = totals.expenses_by_category.get(rule.category, ZERO)
         remaining = rule.amount - current_value
         status = "ok" if current_value <= rule.amount else "over"
     elif rule_type == "account_cap":
         if rule.account_id is None:
             raise ValueError("account_cap requires an account_id.")
-        current_value = _sum_expenses(
-            filtered,
-            account_id=rule.account_id,
-        )
+        current_value = totals.expenses_by_account.get(rule.account_id, ZERO)
         remaining = rule.amount - current_value
         status = "ok" if current_value <= rule.amount else "over"
     elif rule_type == "savings_target":
-        income = _sum_income(filtered)
-        expenses = _sum_expenses(filtered)
-        current_value = income - expenses
+        current_value = totals.income - totals.expenses
         remaining = rule.amount - current_value
         status = "met" if current_value >= rule.amount else "short"
     else:
@@ -85,35 +120,6 @@ def evaluate_budget(
     )
 
 
-def _sum_expenses(
-    transactions: Iterable[Transaction],
-    *,
-    category: Optional[str] = None,
-    account_id: Optional[int] = None,
-) -> Decimal:
-    total = ZERO
-    for txn in transactions:
-        txn_type = txn.type.strip().lower()
-        if txn_type != "expense":
-            continue
-        if category is not None and txn.category != category:
-            continue
-        if account_id is not None and txn.account_id != account_id:
-            continue
-        total += _coerce_amount(txn.amount)
-    return total
-
-
-def _sum_income(transactions: Iterable[Transaction]) -> Decimal:
-    total = ZERO
-    for txn in transactions:
-        txn_type = txn.type.strip().lower()
-        if txn_type != "income":
-            continue
-        total += _coerce_amount(txn.amount)
-    return total
-
-
 def _coerce_amount(amount: Decimal) -> Decimal:
     if isinstance(amount, Decimal):
         return amount
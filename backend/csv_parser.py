@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import csv
 import io
+import itertools
 import re
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
+from typing import Iterable, Iterator
 
 from pydantic import BaseModel
 
@@ -19,6 +21,7 @@ class ParsedTransaction(BaseModel):
 class CSVParseResult(BaseModel):
     card_type: str
     rows: list[ParsedTransaction]
+    total_amount: Decimal = Decimal("0")
 
 
 FIELD_MAPS: dict[str, dict[str, list[str]]] = {
@@ -81,23 +84,28 @@ HEADER_KEYWORDS = {
 DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d", "%m-%d-%Y", "%d/%m/%Y", "%d %b %Y", "%d %B %Y")
 
 
-def parse_transactions_csv(contents: str) -> CSVParseResult:
-    reader = csv.reader(io.StringIO(contents))
-    rows = list(reader)
-    if not rows:
+def parse_transactions_csv(contents: str | Iterable[str]) -> CSVParseResult:
+    """Parse a bank/card CSV export.
+
+    ``contents`` may be the decoded text or any iterable of lines (such as a
+    text-mode file), in which case rows are read incrementally.
+    """
+    source = io.StringIO(contents) if isinstance(contents, str) else contents
+    reader = csv.reader(source)
+    first_row = next(reader, None)
+    if first_row is None:
         raise ValueError("CSV missing header row.")
 
-    first_row = rows[0]
     if looks_like_header(first_row):
         fieldnames = first_row
-        data_rows = rows[1:]
+        data_rows: Iterator[list[str]] = reader
         inferred_card_type = None
     else:
         inferred = infer_header_from_row(first_row)
         if inferred is None:
             raise ValueError("Unsupported CSV format.")
         inferred_card_type, fieldnames = inferred
-        data_rows = rows
+        data_rows = itertools.chain([first_row], reader)
 
     card_type = detect_card_type(fieldnames) or inferred_card_type
     if card_type is None:
@@ -114,12 +122,16 @@ def parse_transactions_csv(contents: str) -> CSVParseResult:
     if not date_header or not description_header or not (amount_header or debit_header):
         raise ValueError("CSV headers missing required fields.")
 
-    raw_rows = [row_to_dict(fieldnames, row) for row in data_rows]
+    raw_rows: Iterator[dict[str, str | None]] = (
+        row_to_dict(fieldnames, row) for row in data_rows
+    )
     positive_expense = None
     if amount_header:
-        positive_expense = detect_amount_convention(raw_rows, amount_header)
+        sample_rows, raw_rows = sample_amount_rows(raw_rows, amount_header)
+        positive_expense = detect_amount_convention(sample_rows, amount_header)
 
     rows: list[ParsedTransaction] = []
+    total_amount = Decimal("0")
     for row in raw_rows:
         parsed = parse_row(
             row,
@@ -133,8 +145,9 @@ def parse_transactions_csv(contents: str) -> CSVParseResult:
         )
         if parsed is not None:
             rows.append(parsed)
+            total_amount += parsed.amount
 
-    return CSVParseResult(card_type=card_type, rows=rows)
+    return CSVParseResult(card_type=card_type, rows=rows, total_amount=total_amount)
 
 
 def looks_like_header(row: list[str]) -> bool:
@@ -242,6 +255,12 @@ def parse_date(value: str | None) -> date | None:
     cleaned = clean_text(value)
     if not cleaned:
         return None
+    if len(cleaned) == 10 and cleaned[4] == "-" and cleaned[7] == "-":
+        # ISO dates can only match %Y-%m-%d, so skip the strptime scan.
+        try:
+            return date.fromisoformat(cleaned)
+        except ValueError:
+            pass
     for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(cleaned, fmt).date()
@@ -295,6 +314,27 @@ def find_header(fieldnames: list[str], candidates: list[str]) -> str | None:
     return None
 
 
+def sample_amount_rows(
+    rows: Iterator[dict[str, str | None]], amount_header: str, limit: int = 10
+) -> tuple[list[dict[str, str | None]], Iterator[dict[str, str | None]]]:
+    """Buffer rows until ``limit`` non-zero amounts are seen.
+
+    Returns the buffered sample and an iterator that replays it before the
+    remaining rows, so the amount convention can be detected without reading
+    the whole file up front.
+    """
+    sample: list[dict[str, str | None]] = []
+    seen = 0
+    for row in rows:
+        sample.append(row)
+        amount_value = parse_decimal(row.get(amount_header))
+        if amount_value is not None and amount_value != 0:
+            seen += 1
+            if seen >= limit:
+                break
+    return sample, itertools.chain(sample, rows)
+
+
 def detect_amount_convention(rows: list[dict[str, str | None]], amount_header: str) -> bool:
     positive = 0
     negative = 0
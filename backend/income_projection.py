@@ -12,14 +12,14 @@ from backend.recurring_projection import (
 )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IncomeTransaction:
     date: date
     amount: Decimal
     account_id: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProjectedIncome:
     date: date
     amount: Decimal
@@ -1,17 +1,31 @@
 import calendar
+import hashlib
+import heapq
+import io
+import itertools
+import operator
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR, ROUND_UP
 
+import anyio.to_thread
 import bcrypt
-from fastapi import FastAPI, HTTPException, Header, Query, UploadFile, File
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Header, Query, Request, UploadFile, File
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, TypeAdapter, model_validator
+from pydantic_core import PydanticCustomError
 from sqlalchemy import (
     Column,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     MetaData,
     Numeric,
@@ -19,17 +33,28 @@ from sqlalchemy import (
     Table,
     UniqueConstraint,
     and_,
+    bindparam,
     case,
     or_,
     create_engine,
+    event,
+    exists,
+    extract,
+    false,
     func,
     insert,
+    inspect,
+    literal,
     select,
+    union_all,
     update,
 )
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.exc import IntegrityError
 
-from backend.budget_engine import BudgetRule, Transaction, evaluate_budget
+from backend.budget_engine import BudgetRule, BudgetTotals, evaluate_budget_totals
 from backend.classification_engine import (
     extract_merchant_patterns,
     learn_from_transactions,
@@ -43,27 +68,164 @@ from backend.currency_conversion import (
     convert_amount,
 )
 from backend.income_projection import IncomeTransaction, RecurringSchedule, project_income
-from backend.recurring_projection import ActualTransaction, project_recurring_schedule
+from backend.recurring_projection import (
+    ActualTransaction,
+    ProjectedEntry,
+    project_recurring_schedule,
+)
+
+
+def _vary_on_origin(headers: list) -> list:
+    """Add Origin to the response's Vary header, merging into an existing one."""
+    for index, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            tokens = {token.strip().lower() for token in value.split(b",")}
+            if b"origin" not in tokens and b"*" not in tokens:
+                headers[index] = (name, value + b", Origin")
+            return headers
+    headers.append((b"vary", b"Origin"))
+    return headers
+
+
+class SingleOriginCORSMiddleware:
+    """CORS for the one configured frontend origin.
+
+    Preflights are answered straight from precomputed header bytes instead of
+    going through Starlette's generic CORSMiddleware.
+    """
+
+    def __init__(self, app, origin: str) -> None:
+        self.app = app
+        self.origin = origin.encode("latin-1")
+        self.simple_headers = [
+            (b"access-control-allow-origin", self.origin),
+            (b"access-control-allow-credentials", b"true"),
+        ]
+        self.preflight_headers = self.simple_headers + [
+            (b"vary", b"Origin"),
+            (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+            (b"access-control-max-age", b"600"),
+            (b"content-length", b"0"),
+        ]
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = dict(scope["headers"])
+        if request_headers.get(b"origin") != self.origin:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and b"access-control-request-method" in request_headers:
+            headers = self.preflight_headers
+            requested_headers = request_headers.get(b"access-control-request-headers")
+            if requested_headers:
+                # Credentialed requests cannot use a literal "*", so echo them.
+                headers = headers + [(b"access-control-allow-headers", requested_headers)]
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = _vary_on_origin(list(message.get("headers", [])))
+                message["headers"] = headers + self.simple_headers
+            await send(message)
 
-app = FastAPI()
+        await self.app(scope, receive, send_with_cors)
+
+
+app = FastAPI(default_response_class=ORJSONResponse)
 
 frontend_origin = os.getenv("FRONTEND_ORIGIN", "http://localhost:3000")
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[frontend_origin],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(SingleOriginCORSMiddleware, origin=frontend_origin)
+
+
+# Error type raised by BudgetRulePayload's validator. Only these errors are
+# reported as a 400 with a plain message, matching the handlers that validate
+# inline; every other validation error keeps FastAPI's 422.
+BUDGET_RULE_ERROR = "budget_rule"
+
+
+@app.exception_handler(RequestValidationError)
+async def budget_rule_error_handler(request: Request, exc: RequestValidationError):
+    errors = exc.errors()
+    if errors and all(error["type"] == BUDGET_RULE_ERROR for error in errors):
+        return ORJSONResponse(status_code=400, content={"detail": errors[0]["msg"]})
+    return await request_validation_exception_handler(request, exc)
+
 
 database_url = os.getenv("DATABASE_URL", "sqlite:///./monetra.db")
 connect_args = {}
+engine_options = {}
 if database_url.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
-
-engine = create_engine(database_url, connect_args=connect_args)
+else:
+    engine_options = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "5")),
+        "pool_recycle": 3600,
+        "pool_pre_ping": True,
+    }
+    if database_url.startswith(("postgresql://", "postgresql+psycopg2://")):
+        # INSERT executemany already batches via insertmanyvalues; this also
+        # routes UPDATE/DELETE executemany through psycopg2's execute_batch.
+        engine_options["executemany_mode"] = "values_plus_batch"
+        engine_options["executemany_batch_page_size"] = 500
+
+engine = create_engine(
+    database_url,
+    connect_args=connect_args,
+    query_cache_size=1200,
+    **engine_options,
+)
 metadata = MetaData()
 
+
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        # WAL lets readers proceed while a request holds the write lock.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+# INSERT construct with ON CONFLICT support for the configured backend.
+dialect_insert = sqlite_insert if engine.dialect.name == "sqlite" else postgresql_insert
+
+
+@contextmanager
+def read_conn():
+    """Connection for read-only endpoints, without a BEGIN/COMMIT round trip."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        yield conn
+
+
+read_query_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("READ_QUERY_WORKERS", "8")), thread_name_prefix="read-query"
+)
+
+
+def fetch_all(stmt) -> list:
+    with read_conn() as conn:
+        return conn.execute(stmt).mappings().all()
+
+
+def fetch_all_concurrently(*statements) -> list[list]:
+    """Run independent read queries on separate connections at the same time.
+
+    The first statement runs on the calling thread; the rest are handed to
+    the read-query pool, so latency is the slowest query rather than the sum.
+    """
+    futures = [read_query_pool.submit(fetch_all, stmt) for stmt in statements[1:]]
+    first = fetch_all(statements[0])
+    return [first, *(future.result() for future in futures)]
+
+
 def normalize_currency(value: str) -> str:
     normalized = value.strip().upper()
     if len(normalized) != 3 or not normalized.isalpha():
@@ -202,6 +364,7 @@ investment_entries = Table(
     Column("espp_period_id", Integer, ForeignKey("espp_periods.id")),
     Column("type", String(10), nullable=False),
     Column("date", Date, nullable=False),
+    Index("uq_investment_entries_transaction_id", "transaction_id", unique=True),
 )
 
 espp_periods = Table(
@@ -296,9 +459,47 @@ transaction_classification_rules = Table(
     UniqueConstraint("user_id", "pattern", "category", name="uq_classification_rules_user_pattern_category"),
 )
 
+def find_duplicate_investment_entries(conn) -> list[int]:
+    """Transaction ids with more than one investment entry."""
+    return conn.execute(
+        select(investment_entries.c.transaction_id)
+        .group_by(investment_entries.c.transaction_id)
+        .having(func.count() > 1)
+        .order_by(investment_entries.c.transaction_id)
+    ).scalars().all()
+
+
 @app.on_event("startup")
 def init_db() -> None:
     metadata.create_all(engine)
+    # create_all skips indexes on tables that already exist; the upsert in
+    # update_transaction needs the unique one.
+    existing = {index["name"] for index in inspect(engine).get_indexes("investment_entries")}
+    missing = [index for index in investment_entries.indexes if index.name not in existing]
+    if not missing:
+        return
+    with engine.begin() as conn:
+        if any(index.unique for index in missing):
+            # Entries are ledger rows that feed the investment positions, so
+            # duplicates are left for manual resolution rather than deleted.
+            duplicates = find_duplicate_investment_entries(conn)
+            if duplicates:
+                raise RuntimeError(
+                    "Cannot create uq_investment_entries_transaction_id: "
+                    "investment_entries has several rows for transaction_id "
+                    + ", ".join(str(transaction_id) for transaction_id in duplicates)
+                    + ". Resolve them and restart."
+                )
+        for index in missing:
+            index.create(conn)
+
+
+@app.on_event("startup")
+async def configure_threadpool() -> None:
+    # Sync handlers run on anyio's worker threads (40 by default); size it so
+    # requests waiting on the database don't exhaust it before the pool does.
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter.total_tokens = int(os.getenv("THREADPOOL_SIZE", "64"))
 
 
 class CredentialsPayload(BaseModel):
@@ -339,6 +540,8 @@ class TransactionType:
 
     @classmethod
     def validate(cls, value: str) -> str:
+        if value in cls.values:
+            return value
         normalized = value.strip().lower()
         if normalized not in cls.values:
             raise ValueError("Invalid transaction type.")
@@ -350,6 +553,8 @@ class RecurringScheduleKind:
 
     @classmethod
     def validate(cls, value: str) -> str:
+        if value in cls.values:
+            return value
         normalized = value.strip().lower()
         if normalized not in cls.values:
             raise ValueError("Invalid recurring schedule kind.")
@@ -361,6 +566,8 @@ class AccountType:
 
     @classmethod
     def validate(cls, value: str) -> str:
+        if value in cls.values:
+            return value
         normalized = value.strip().lower()
         if normalized not in cls.values:
             raise ValueError("Invalid account type.")
@@ -372,6 +579,8 @@ class InvestmentAssetType:
 
     @classmethod
     def validate(cls, value: str) -> str:
+        if value in cls.values:
+            return value
         normalized = value.strip().lower()
         if normalized not in cls.values:
             raise ValueError("Invalid asset type.")
@@ -383,6 +592,8 @@ class EsppPeriodStatus:
 
     @classmethod
     def validate(cls, value: str) -> str:
+        if value in cls.values:
+            return value
         normalized = value.strip().lower()
         if normalized not in cls.values:
             raise ValueError("Invalid ESPP period status.")
@@ -394,6 +605,8 @@ class RsuVestingStatus:
 
     @classmethod
     def validate(cls, value: str) -> str:
+        if value in cls.values:
+            return value
         normalized = value.strip().lower()
         if normalized not in cls.values:
             raise ValueError("Invalid RSU vesting status.")
@@ -407,6 +620,11 @@ ESPP_SHARES_QUANT = Decimal("0.00000001")
 ESPP_DISCOUNT_RATE = Decimal("0.85")
 ESPP_TAX_RATE = Decimal("0.47")
 RSU_TAX_RATE = Decimal("0.47")
+DECIMAL_ZERO = Decimal("0")
+PERCENT_SCALE = Decimal("100")
+# Rows per multi-row INSERT when committing CSV imports; keeps each statement
+# well under SQLite's bound-parameter limit.
+IMPORT_INSERT_BATCH_SIZE = 500
 
 
 class CategoryGroup:
@@ -414,6 +632,8 @@ class CategoryGroup:
 
     @classmethod
     def normalize(cls, value: str) -> str:
+        if value in cls.values:
+            return value
         normalized = value.strip().lower()
         if normalized not in cls.values:
             raise ValueError("Invalid category group.")
@@ -466,6 +686,9 @@ class TransactionResponse(TransactionPayload):
     currency: str
 
 
+TRANSACTION_LIST_ADAPTER = TypeAdapter(list[TransactionResponse])
+
+
 class ConvertToHomePayload(BaseModel):
     record_id: int
     conversion_date: date
@@ -484,30 +707,30 @@ class BudgetRulePayload(BaseModel):
     category: str | None = None
     account_id: int | None = None
 
-    @classmethod
-    def validate_payload(cls, payload: "BudgetRulePayload") -> "BudgetRulePayload":
-        normalized_type = payload.rule_type.strip().lower()
+    @model_validator(mode="after")
+    def validate_rule(self) -> "BudgetRulePayload":
+        normalized_type = self.rule_type.strip().lower()
         allowed_types = {"category_cap", "account_cap", "savings_target"}
         if normalized_type not in allowed_types:
-            raise ValueError("Invalid budget rule type.")
-        payload.rule_type = normalized_type
-        if payload.amount <= 0:
-            raise ValueError("Budget amount must be greater than zero.")
+            raise PydanticCustomError(BUDGET_RULE_ERROR, "Invalid budget rule type.")
+        self.rule_type = normalized_type
+        if self.amount <= 0:
+            raise PydanticCustomError(BUDGET_RULE_ERROR, "Budget amount must be greater than zero.")
 
-        payload.category = payload.category.strip() if payload.category else None
+        self.category = self.category.strip() if self.category else None
         if normalized_type == "category_cap":
-            if not payload.category:
-                raise ValueError("Category cap requires a category.")
-            payload.account_id = None
+            if not self.category:
+                raise PydanticCustomError(BUDGET_RULE_ERROR, "Category cap requires a category.")
+            self.account_id = None
         elif normalized_type == "account_cap":
-            if payload.account_id is None:
-                raise ValueError("Account cap requires an account.")
-            payload.category = None
+            if self.account_id is None:
+                raise PydanticCustomError(BUDGET_RULE_ERROR, "Account cap requires an account.")
+            self.category = None
         else:
-            payload.category = None
-            payload.account_id = None
+            self.category = None
+            self.account_id = None
 
-        return payload
+        return self
 
 
 class BudgetRuleResponse(BaseModel):
@@ -536,6 +759,9 @@ class BudgetEvaluationResponse(BaseModel):
     source_currencies: list[str] | None = None
 
 
+BUDGET_EVALUATION_LIST_ADAPTER = TypeAdapter(list[BudgetEvaluationResponse])
+
+
 class MonthlyTrendResponse(BaseModel):
     month: str
     total_income: Decimal
@@ -692,6 +918,9 @@ class RecurringProjectionEntry(BaseModel):
     notes: str | None = None
 
 
+RECURRING_PROJECTION_LIST_ADAPTER = TypeAdapter(list[RecurringProjectionEntry])
+
+
 def _normalize_frequency(value: str) -> str:
     normalized = "".join(ch for ch in value.strip().lower() if ch.isalnum())
     if normalized == "byweekly":
@@ -739,6 +968,9 @@ class RecurringScheduleResponse(BaseModel):
     created_at: datetime | None = None
 
 
+RECURRING_SCHEDULE_LIST_ADAPTER = TypeAdapter(list[RecurringScheduleResponse])
+
+
 class CategoryPayload(BaseModel):
     name: str
     group: str | None = None
@@ -786,6 +1018,9 @@ class InvestmentResponse(BaseModel):
     created_at: datetime | None = None
 
 
+INVESTMENT_LIST_ADAPTER = TypeAdapter(list[InvestmentResponse])
+
+
 class InvestmentPositionResponse(BaseModel):
     id: int
     name: str
@@ -813,6 +1048,9 @@ class InvestmentActivityResponse(BaseModel):
     date: date
 
 
+INVESTMENT_ACTIVITY_LIST_ADAPTER = TypeAdapter(list[InvestmentActivityResponse])
+
+
 class InvestmentRealizedResponse(BaseModel):
     id: int
     investment_id: int
@@ -1184,12 +1422,59 @@ class LearnPatternsResponse(BaseModel):
     patterns_learned: int
 
 
+# bcrypt releases the GIL, so hashing runs on a pool sized to the CPU count to
+# cap concurrent hashes. The request thread still waits for its result; once
+# BCRYPT_MAX_PENDING hashes are queued or running, further work is shed with a 503.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = os.cpu_count() or 1
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", str(BCRYPT_WORKERS * 8)))
+bcrypt_pool = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+bcrypt_lock = threading.Lock()
+bcrypt_pending = 0
+
+
+def run_bcrypt(func, *args):
+    global bcrypt_pending
+    with bcrypt_lock:
+        if bcrypt_pending >= BCRYPT_MAX_PENDING:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many authentication requests. Please retry.",
+                headers={"Retry-After": "1"},
+            )
+        bcrypt_pending += 1
+    try:
+        return bcrypt_pool.submit(func, *args).result()
+    finally:
+        with bcrypt_lock:
+            bcrypt_pending -= 1
+
+
+# Checked against on unknown emails so every login pays one bcrypt round and
+# goes through the same backpressure as real accounts.
+DUMMY_PASSWORD_HASH = bcrypt.hashpw(
+    b"monetra-unknown-user", bcrypt.gensalt(BCRYPT_ROUNDS)
+).decode("utf-8")
+
+
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    hashed = run_bcrypt(
+        bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt(BCRYPT_ROUNDS)
+    )
+    return hashed.decode("utf-8")
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+    return run_bcrypt(
+        bcrypt.checkpw, password.encode("utf-8"), hashed_password.encode("utf-8")
+    )
+
+
+# Known user ids, so authenticated requests skip the users lookup. Users are
+# never deleted, and the TTL bounds staleness if that changes.
+user_id_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+user_id_cache_lock = threading.Lock()
+_USER_ID_STMT = select(users.c.id).where(users.c.id == bindparam("uid"))
 
 
 def get_user_id(x_user_id: str | None = Header(None)) -> int:
@@ -1199,10 +1484,15 @@ def get_user_id(x_user_id: str | None = Header(None)) -> int:
         user_id = int(x_user_id)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail="Invalid user identity.") from exc
+    with user_id_cache_lock:
+        if user_id in user_id_cache:
+            return user_id
     with engine.begin() as conn:
-        result = conn.execute(select(users.c.id).where(users.c.id == user_id))
+        result = conn.execute(_USER_ID_STMT, {"uid": user_id})
         if not result.first():
             raise HTTPException(status_code=404, detail="User not found.")
+    with user_id_cache_lock:
+        user_id_cache[user_id] = True
     return user_id
 
 
@@ -1252,23 +1542,27 @@ def set_home_currency_if_missing(conn, user_id: int, currency: str) -> None:
     )
 
 
+_DEFAULT_CATEGORY_NAMES = union_all(
+    *(select(literal(name, String).label("name")) for name in DEFAULT_CATEGORIES)
+).subquery("default_categories")
+# Seeds the defaults only when the user has no categories, in one statement.
+_SEED_DEFAULT_CATEGORIES_STMT = insert(categories).from_select(
+    ["user_id", "name"],
+    select(bindparam("uid", type_=Integer), _DEFAULT_CATEGORY_NAMES.c.name).where(
+        ~exists().where(categories.c.user_id == bindparam("uid"))
+    ),
+)
+
+
 def ensure_default_categories(conn, user_id: int) -> None:
-    existing = conn.execute(
-        select(categories.c.id).where(categories.c.user_id == user_id).limit(1)
-    ).first()
-    if existing:
-        return
-    conn.execute(
-        insert(categories),
-        [{"user_id": user_id, "name": name} for name in DEFAULT_CATEGORIES],
-    )
+    conn.execute(_SEED_DEFAULT_CATEGORIES_STMT, {"uid": user_id})
 
 
 def ensure_single_open_espp_period(conn, user_id: int, exclude_period_id: int | None = None) -> None:
     conditions = [espp_periods.c.user_id == user_id, espp_periods.c.status == "open"]
     if exclude_period_id is not None:
         conditions.append(espp_periods.c.id != exclude_period_id)
-    existing = conn.execute(select(espp_periods.c.id).where(*conditions).limit(1)).first()
+    existing = conn.execute(select(exists().where(*conditions))).scalar()
     if existing:
         raise HTTPException(status_code=400, detail="Only one ESPP period can be open at a time.")
 
@@ -1488,31 +1782,82 @@ def compute_espp_batch_valuation(
     )
 
 
-def category_in_use(conn, user_id: int, name: str) -> bool:
-    txn_match = conn.execute(
-        select(transactions.c.id)
-        .where(transactions.c.user_id == user_id, transactions.c.category == name)
-        .limit(1)
-    ).first()
-    if txn_match:
-        return True
-    rule_match = conn.execute(
-        select(budget_rules.c.id)
-        .where(budget_rules.c.user_id == user_id, budget_rules.c.category == name)
-        .limit(1)
-    ).first()
-    return bool(rule_match)
-
-
-def get_category_group(conn, user_id: int, name: str | None) -> str | None:
-    if not name:
-        return None
-    result = conn.execute(
-        select(categories.c.group).where(categories.c.user_id == user_id, categories.c.name == name)
-    ).first()
-    if not result:
-        return None
-    return result[0]
+# Per-user category name -> group mapping, so reports can bucket expenses
+# without joining transactions to categories on the name column.
+category_group_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+# Bumped by every invalidation. A reader only stores the map it queried if no
+# invalidation landed in between, so a slow read can't cache pre-commit data.
+category_group_generation: dict[int, int] = {}
+category_group_cache_lock = threading.Lock()
+
+
+def get_category_groups(conn, user_id: int) -> dict[str, str]:
+    with category_group_cache_lock:
+        cached = category_group_cache.get(user_id)
+        generation = category_group_generation.get(user_id, 0)
+    if cached is not None:
+        return cached
+    rows = conn.execute(
+        select(categories.c.name, categories.c.group).where(
+            categories.c.user_id == user_id, categories.c.group.isnot(None)
+        )
+    ).all()
+    groups = {name: group for name, group in rows}
+    with category_group_cache_lock:
+        if category_group_generation.get(user_id, 0) == generation:
+            category_group_cache[user_id] = groups
+    return groups
+
+
+def invalidate_category_groups(user_id: int) -> None:
+    """Drop the cached map; call after the writing transaction has committed."""
+    with category_group_cache_lock:
+        category_group_cache.pop(user_id, None)
+        category_group_generation[user_id] = category_group_generation.get(user_id, 0) + 1
+
+
+# Serialized list responses keyed on (resource, user_id). The dashboard polls
+# these lists, so unchanged data is served from memory with an ETag and the
+# browser can revalidate with If-None-Match for a bodiless 304.
+list_response_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+# Same store guard as category_group_generation, per (resource, user_id).
+list_response_generation: dict[tuple[str, int], int] = {}
+list_response_cache_lock = threading.Lock()
+
+
+def cached_list_response(
+    resource: str, user_id: int, if_none_match: str | None, build
+) -> Response:
+    key = (resource, user_id)
+    with list_response_cache_lock:
+        cached = list_response_cache.get(key)
+        generation = list_response_generation.get(key, 0)
+    if cached is None:
+        body = build()
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        cached = (body, etag)
+        with list_response_cache_lock:
+            if list_response_generation.get(key, 0) == generation:
+                list_response_cache[key] = cached
+    body, etag = cached
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def json_list_response(adapter: TypeAdapter, items: list) -> Response:
+    # Returning a Response directly skips FastAPI re-validating every item
+    # against response_model; the items are built here from typed columns.
+    return Response(content=adapter.dump_json(items), media_type="application/json")
+
+
+def invalidate_list_response(resource: str, user_id: int) -> None:
+    """Drop the cached list; call after the writing transaction has committed."""
+    key = (resource, user_id)
+    with list_response_cache_lock:
+        list_response_cache.pop(key, None)
+        list_response_generation[key] = list_response_generation.get(key, 0) + 1
 
 
 def extract_investment_entry(payload: TransactionPayload) -> dict | None:
@@ -1545,6 +1890,45 @@ def extract_investment_entry(payload: TransactionPayload) -> dict | None:
     }
 
 
+def fetch_transaction_references(
+    conn, user_id: int, payload: TransactionPayload, transaction_id: int | None = None
+):
+    """Resolve everything a transaction write checks in a single round trip.
+
+    Returns account/investment ownership and, when updating, whether the
+    transaction has an investment entry and its current currency. The
+    category's group comes from the cached per-user category groups.
+    """
+    if payload.investment_id is not None:
+        investment_exists = exists().where(
+            investments.c.id == payload.investment_id, investments.c.user_id == user_id
+        )
+    else:
+        investment_exists = false()
+    columns = [
+        exists()
+        .where(accounts.c.id == payload.account_id, accounts.c.user_id == user_id)
+        .label("account_exists"),
+        investment_exists.label("investment_exists"),
+    ]
+    if transaction_id is not None:
+        columns.append(
+            exists()
+            .where(
+                investment_entries.c.transaction_id == transaction_id,
+                investment_entries.c.user_id == user_id,
+            )
+            .label("has_investment_entry")
+        )
+        columns.append(
+            select(transactions.c.currency)
+            .where(transactions.c.id == transaction_id, transactions.c.user_id == user_id)
+            .scalar_subquery()
+            .label("existing_currency")
+        )
+    return conn.execute(select(*columns)).mappings().one()
+
+
 def recalculate_investment_position(conn, user_id: int, investment_id: int) -> None:
     stmt = (
         select(
@@ -1673,13 +2057,12 @@ def shift_month_keep_day(value: date, months: int) -> date:
 
 
 def iter_months(start_value: date, end_value: date) -> list[date]:
-    months: list[date] = []
-    cursor = month_start(start_value)
-    end_month = month_start(end_value)
-    while cursor <= end_month:
-        months.append(cursor)
-        cursor = shift_month(cursor, 1)
-    return months
+    start_index = start_value.year * 12 + start_value.month - 1
+    end_index = end_value.year * 12 + end_value.month - 1
+    return [
+        date(month_index // 12, month_index % 12 + 1, 1)
+        for month_index in range(start_index, end_index + 1)
+    ]
 
 
 def month_end(value: date) -> date:
@@ -1688,6 +2071,18 @@ def month_end(value: date) -> date:
 
 
 def parse_month_value(value: str) -> date:
+    # Fast path for canonical YYYY-MM / YYYY-MM-DD; strptime handles the
+    # unpadded variants it has always accepted.
+    if len(value) == 7 and value[4] == "-":
+        try:
+            return date.fromisoformat(f"{value}-01")
+        except ValueError:
+            pass
+    elif len(value) == 10 and value[4] == "-" and value[7] == "-":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
     try:
         return datetime.strptime(value, "%Y-%m").date()
     except ValueError:
@@ -1923,87 +2318,66 @@ def fetch_totals_by_currency(
     }
 
 
-def fetch_expense_group_totals(
-    user_id: int, start_date: date, end_date: date, home_currency: str
+def fetch_period_totals(
+    conn, user_id: int, start_date: date, end_date: date, home_currency: str
 ) -> tuple[dict[str, Decimal], dict[str, list[str]]]:
-    group_expr = categories.c.group.label("group")
-    total_spent_expr = func.coalesce(func.sum(transactions.c.amount), 0).label("total_spent")
+    """Income and needs/wants/investments expense totals for a period.
+
+    One grouped query covers all four buckets; expense categories are mapped
+    to their group via the cached category groups, and amounts are converted
+    to the home currency per bucket afterwards.
+    """
+    total_expr = func.coalesce(func.sum(transactions.c.amount), 0).label("total")
     stmt = (
-        select(group_expr, transactions.c.currency, total_spent_expr)
-        .select_from(
-            transactions.join(
-                categories,
-                (transactions.c.user_id == categories.c.user_id)
-                & (transactions.c.category == categories.c.name),
-            )
+        select(
+            transactions.c.type,
+            transactions.c.category,
+            transactions.c.currency,
+            total_expr,
         )
         .where(
             transactions.c.user_id == user_id,
-            transactions.c.type == "expense",
+            transactions.c.type.in_(("income", "expense")),
             transactions.c.date >= start_date,
             transactions.c.date <= end_date,
-            categories.c.group.isnot(None),
         )
-        .group_by(group_expr, transactions.c.currency)
+        .group_by(transactions.c.type, transactions.c.category, transactions.c.currency)
     )
-    with engine.begin() as conn:
-        rows = conn.execute(stmt).mappings().all()
+    rows = conn.execute(stmt).mappings().all()
+    category_groups = get_category_groups(conn, user_id)
 
-    totals_by_group: dict[str, dict[str, Decimal]] = {
+    totals_by_bucket: dict[str, dict[str, Decimal]] = {
+        "income": {},
         "needs": {},
         "wants": {},
         "investments": {},
     }
-    source_currencies: dict[str, set[str]] = {
-        "needs": set(),
-        "wants": set(),
-        "investments": set(),
-    }
     for row in rows:
-        group = row["group"]
-        if group not in totals_by_group:
+        if row["type"] == "income":
+            bucket = "income"
+        else:
+            bucket = category_groups.get(row["category"])
+        if bucket not in totals_by_bucket:
+            continue
+        if bucket == "income" and row["currency"] is None:
             continue
         currency = safe_normalize_currency(row["currency"], home_currency)
-        total_decimal = coerce_decimal(row["total_spent"])
-        totals_by_group[group][currency] = total_decimal
-        source_currencies[group].add(currency)
+        bucket_totals = totals_by_bucket[bucket]
+        bucket_totals[currency] = bucket_totals.get(currency, DECIMAL_ZERO) + coerce_decimal(
+            row["total"]
+        )
 
     totals: dict[str, Decimal] = {}
     source_currency_lists: dict[str, list[str]] = {}
-    for group, totals_by_currency in totals_by_group.items():
-        group_total, _ = sum_converted_amounts(totals_by_currency, home_currency)
-        totals[group] = group_total
-        source_currency_lists[group] = sorted(source_currencies[group])
-
+    for bucket, totals_by_currency in totals_by_bucket.items():
+        bucket_total, bucket_currencies = sum_converted_amounts(
+            totals_by_currency, home_currency
+        )
+        totals[bucket] = bucket_total
+        source_currency_lists[bucket] = bucket_currencies
     return totals, source_currency_lists
 
 
-def fetch_income_total(user_id: int, start_date: date, end_date: date) -> Decimal:
-    total_income_expr = func.coalesce(func.sum(transactions.c.amount), 0)
-    stmt = select(total_income_expr).where(
-        transactions.c.user_id == user_id,
-        transactions.c.type == "income",
-        transactions.c.date >= start_date,
-        transactions.c.date <= end_date,
-    )
-    with engine.begin() as conn:
-        total_value = conn.execute(stmt).scalar_one()
-    return total_value if isinstance(total_value, Decimal) else Decimal(str(total_value))
-
-
-def fetch_expense_total(user_id: int, start_date: date, end_date: date) -> Decimal:
-    total_expense_expr = func.coalesce(func.sum(transactions.c.amount), 0)
-    stmt = select(total_expense_expr).where(
-        transactions.c.user_id == user_id,
-        transactions.c.type == "expense",
-        transactions.c.date >= start_date,
-        transactions.c.date <= end_date,
-    )
-    with engine.begin() as conn:
-        total_value = conn.execute(stmt).scalar_one()
-    return total_value if isinstance(total_value, Decimal) else Decimal(str(total_value))
-
-
 def fetch_transaction_count(user_id: int, start_date: date, end_date: date) -> int:
     total_count_expr = func.count()
     stmt = select(total_count_expr).where(
@@ -2022,6 +2396,15 @@ def health() -> dict:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+def metrics() -> dict:
+    return {
+        "bcrypt_queue_length": bcrypt_pending,
+        "bcrypt_max_pending": BCRYPT_MAX_PENDING,
+        "bcrypt_workers": BCRYPT_WORKERS,
+    }
+
+
 @app.post("/auth/signup", response_model=UserResponse)
 def signup(payload: CredentialsPayload) -> UserResponse:
     email = payload.email.strip().lower()
@@ -2045,7 +2428,9 @@ def signup(payload: CredentialsPayload) -> UserResponse:
 
     if not row:
         raise HTTPException(status_code=500, detail="Failed to create user.")
-    return UserResponse(id=row["id"], email=row["email"], created_at=row["created_at"])
+    return UserResponse.model_construct(
+        id=row["id"], email=row["email"], created_at=row["created_at"]
+    )
 
 
 @app.post("/auth/login", response_model=UserResponse)
@@ -2055,10 +2440,14 @@ def login(payload: CredentialsPayload) -> UserResponse:
         result = conn.execute(select(users).where(users.c.email == email))
         row = result.mappings().first()
 
-    if not row or not verify_password(payload.password, row["hashed_password"]):
+    hashed_password = row["hashed_password"] if row else DUMMY_PASSWORD_HASH
+    password_matches = verify_password(payload.password, hashed_password)
+    if not row or not password_matches:
         raise HTTPException(status_code=401, detail="Invalid credentials.")
 
-    return UserResponse(id=row["id"], email=row["email"], created_at=row["created_at"])
+    return UserResponse.model_construct(
+        id=row["id"], email=row["email"], created_at=row["created_at"]
+    )
 
 
 @app.get("/users/me/settings", response_model=UserSettingsResponse)
@@ -2109,6 +2498,13 @@ def update_user_settings(
     )
 
 
+_LIST_CATEGORIES_STMT = (
+    select(categories)
+    .where(categories.c.user_id == bindparam("uid"))
+    .order_by(categories.c.name.asc(), categories.c.id.asc())
+)
+
+
 @app.get("/categories", response_model=list[CategoryResponse])
 def list_categories(
     x_user_id: str | None = Header(None, alias="x-user-id"),
@@ -2116,22 +2512,17 @@ def list_categories(
     user_id = get_user_id(x_user_id)
     with engine.begin() as conn:
         ensure_default_categories(conn, user_id)
-        result = conn.execute(
-            select(categories)
-            .where(categories.c.user_id == user_id)
-            .order_by(categories.c.name.asc(), categories.c.id.asc())
-        )
-        rows = result.mappings().all()
-    return [
-        CategoryResponse(
-            id=row["id"],
-            user_id=row["user_id"],
-            name=row["name"],
-            group=row["group"],
-            created_at=row["created_at"],
-        )
-        for row in rows
-    ]
+        result = conn.execute(_LIST_CATEGORIES_STMT, {"uid": user_id})
+        return [
+            CategoryResponse.model_construct(
+                id=row["id"],
+                user_id=row["user_id"],
+                name=row["name"],
+                group=row["group"],
+                created_at=row["created_at"],
+            )
+            for row in result.mappings()
+        ]
 
 
 @app.post("/categories", response_model=CategoryResponse)
@@ -2164,7 +2555,8 @@ def create_category(
 
     if not row:
         raise HTTPException(status_code=500, detail="Failed to create category.")
-    return CategoryResponse(
+    invalidate_category_groups(user_id)
+    return CategoryResponse.model_construct(
         id=row["id"],
         user_id=row["user_id"],
         name=row["name"],
@@ -2206,7 +2598,8 @@ def update_category(
 
     if not row:
         raise HTTPException(status_code=404, detail="Category not found.")
-    return CategoryResponse(
+    invalidate_category_groups(user_id)
+    return CategoryResponse.model_construct(
         id=row["id"],
         user_id=row["user_id"],
         name=row["name"],
@@ -2220,43 +2613,61 @@ def delete_category(
     category_id: int, x_user_id: str | None = Header(None, alias="x-user-id")
 ) -> dict:
     user_id = get_user_id(x_user_id)
-    with engine.begin() as conn:
-        result = conn.execute(
-            select(categories.c.id, categories.c.name).where(
-                categories.c.id == category_id, categories.c.user_id == user_id
-            )
+    # Delete only unused categories; the follow-up lookup runs only on failure
+    # to tell a missing category apart from one that is still referenced.
+    delete_stmt = (
+        categories.delete()
+        .where(
+            categories.c.id == category_id,
+            categories.c.user_id == user_id,
+            ~exists().where(
+                transactions.c.user_id == user_id,
+                transactions.c.category == categories.c.name,
+            ),
+            ~exists().where(
+                budget_rules.c.user_id == user_id,
+                budget_rules.c.category == categories.c.name,
+            ),
         )
-        row = result.mappings().first()
-        if not row:
-            raise HTTPException(status_code=404, detail="Category not found.")
-        if category_in_use(conn, user_id, row["name"]):
+        .returning(categories.c.id)
+    )
+    with engine.begin() as conn:
+        if conn.execute(delete_stmt).first() is None:
+            exists_row = conn.execute(
+                select(categories.c.id).where(
+                    categories.c.id == category_id, categories.c.user_id == user_id
+                )
+            ).first()
+            if not exists_row:
+                raise HTTPException(status_code=404, detail="Category not found.")
             raise HTTPException(status_code=409, detail="Category is in use.")
-        delete_stmt = categories.delete().where(
-            categories.c.id == category_id, categories.c.user_id == user_id
-        )
-        conn.execute(delete_stmt)
+    invalidate_category_groups(user_id)
     return {"status": "deleted"}
 
 
+_LIST_ACCOUNTS_STMT = (
+    select(accounts)
+    .where(accounts.c.user_id == bindparam("uid"))
+    .order_by(accounts.c.created_at.desc())
+)
+
+
 @app.get("/accounts", response_model=list[AccountResponse])
 def list_accounts(x_user_id: str | None = Header(None, alias="x-user-id")) -> list[AccountResponse]:
     user_id = get_user_id(x_user_id)
     with engine.begin() as conn:
-        result = conn.execute(
-            select(accounts).where(accounts.c.user_id == user_id).order_by(accounts.c.created_at.desc())
-        )
-        rows = result.mappings().all()
-    return [
-        AccountResponse(
-            id=row["id"],
-            user_id=row["user_id"],
-            name=row["name"],
-            type=row["type"],
-            institution=row["institution"],
-            created_at=row["created_at"],
-        )
-        for row in rows
-    ]
+        result = conn.execute(_LIST_ACCOUNTS_STMT, {"uid": user_id})
+        return [
+            AccountResponse.model_construct(
+                id=row["id"],
+                user_id=row["user_id"],
+                name=row["name"],
+                type=row["type"],
+                institution=row["institution"],
+                created_at=row["created_at"],
+            )
+            for row in result.mappings()
+        ]
 
 
 @app.post("/accounts", response_model=AccountResponse)
@@ -2292,7 +2703,7 @@ def create_account(
 
     if not row:
         raise HTTPException(status_code=500, detail="Failed to create account.")
-    return AccountResponse(
+    return AccountResponse.model_construct(
         id=row["id"],
         user_id=row["user_id"],
         name=row["name"],
@@ -2331,7 +2742,7 @@ def update_account(
 
     if not row:
         raise HTTPException(status_code=404, detail="Account not found.")
-    return AccountResponse(
+    return AccountResponse.model_construct(
         id=row["id"],
         user_id=row["user_id"],
         name=row["name"],
@@ -2355,24 +2766,31 @@ def delete_account(account_id: int, x_user_id: str | None = Header(None, alias="
 @app.get("/investments", response_model=list[InvestmentResponse])
 def list_investments(
     x_user_id: str | None = Header(None, alias="x-user-id"),
-) -> list[InvestmentResponse]:
+    if_none_match: str | None = Header(None, alias="if-none-match"),
+) -> Response:
     user_id = get_user_id(x_user_id)
-    with engine.begin() as conn:
-        result = conn.execute(
-            select(investments).where(investments.c.user_id == user_id).order_by(investments.c.created_at.desc())
-        )
-        rows = result.mappings().all()
-    return [
-        InvestmentResponse(
-            id=row["id"],
-            user_id=row["user_id"],
-            name=row["name"],
-            symbol=row["symbol"],
-            asset_type=row["asset_type"],
-            created_at=row["created_at"],
+
+    def build() -> bytes:
+        with read_conn() as conn:
+            result = conn.execute(
+                select(investments).where(investments.c.user_id == user_id).order_by(investments.c.created_at.desc())
+            )
+            rows = result.mappings().all()
+        return INVESTMENT_LIST_ADAPTER.dump_json(
+            [
+                InvestmentResponse.model_construct(
+                    id=row["id"],
+                    user_id=row["user_id"],
+                    name=row["name"],
+                    symbol=row["symbol"],
+                    asset_type=row["asset_type"],
+                    created_at=row["created_at"],
+                )
+                for row in rows
+            ]
         )
-        for row in rows
-    ]
+
+    return cached_list_response("investments", user_id, if_none_match, build)
 
 
 @app.get("/investments/positions", response_model=list[InvestmentPositionResponse])
@@ -2522,109 +2940,117 @@ def list_investment_positions(
         .order_by(investments.c.created_at.desc())
     )
     with engine.begin() as conn:
-        rows = conn.execute(stmt).mappings().all()
-    return [
-        InvestmentPositionResponse(
-            id=row["id"],
-            name=row["name"],
-            symbol=row["symbol"],
-            total_shares=row["total_shares"],
-            average_cost_per_share=row["average_cost_per_share"],
-            total_cost_basis=row["total_cost_basis"],
-            currency=row["currency"],
-            source=row["source"],
+        return [
+            InvestmentPositionResponse(
+                id=row["id"],
+                name=row["name"],
+                symbol=row["symbol"],
+                total_shares=row["total_shares"],
+                average_cost_per_share=row["average_cost_per_share"],
+                total_cost_basis=row["total_cost_basis"],
+                currency=row["currency"],
+                source=row["source"],
+            )
+            for row in conn.execute(stmt).mappings()
+        ]
+
+
+_LIST_INVESTMENT_ACTIVITY_STMT = (
+    select(
+        investment_entries.c.id,
+        investment_entries.c.investment_id,
+        investment_entries.c.transaction_id,
+        investment_entries.c.quantity,
+        investment_entries.c.price,
+        investment_entries.c.price_per_share,
+        investment_entries.c.total_amount,
+        investment_entries.c.currency,
+        investment_entries.c.realized_profit_loss,
+        transactions.c.amount.label("transaction_amount"),
+        transactions.c.currency.label("transaction_currency"),
+        investment_entries.c.type,
+        investment_entries.c.date,
+        investments.c.name.label("investment_name"),
+        investments.c.symbol.label("investment_symbol"),
+    )
+    .select_from(
+        investment_entries.join(
+            investments, investment_entries.c.investment_id == investments.c.id
+        ).join(
+            transactions,
+            (investment_entries.c.transaction_id == transactions.c.id)
+            & (investment_entries.c.user_id == transactions.c.user_id),
         )
-        for row in rows
-    ]
+    )
+    .where(investment_entries.c.user_id == bindparam("uid"))
+    .order_by(investment_entries.c.date.desc(), investment_entries.c.id.desc())
+)
+_LIST_INVESTMENT_ACTIVITY_BY_INVESTMENT_STMT = _LIST_INVESTMENT_ACTIVITY_STMT.where(
+    investment_entries.c.investment_id == bindparam("investment_id")
+)
 
 
 @app.get("/investments/activity", response_model=list[InvestmentActivityResponse])
 def list_investment_activity(
     investment_id: int | None = None,
     x_user_id: str | None = Header(None, alias="x-user-id"),
-) -> list[InvestmentActivityResponse]:
+) -> Response:
+    user_id = get_user_id(x_user_id)
+    with read_conn() as conn:
+        if investment_id is None:
+            result = conn.execute(_LIST_INVESTMENT_ACTIVITY_STMT, {"uid": user_id})
+        else:
+            result = conn.execute(
+                _LIST_INVESTMENT_ACTIVITY_BY_INVESTMENT_STMT,
+                {"uid": user_id, "investment_id": investment_id},
+            )
+        activity = [
+            InvestmentActivityResponse.model_construct(
+                id=row["id"],
+                investment_id=row["investment_id"],
+                investment_name=row["investment_name"],
+                investment_symbol=row["investment_symbol"],
+                transaction_id=row["transaction_id"],
+                type=row["type"],
+                quantity=row["quantity"],
+                price=row["price"],
+                price_per_share=row["price_per_share"] or row["price"],
+                total_amount=row["total_amount"] or row["transaction_amount"],
+                currency=row["currency"] or row["transaction_currency"],
+                realized_profit_loss=row["realized_profit_loss"],
+                date=row["date"],
+            )
+            for row in result.mappings()
+        ]
+    return json_list_response(INVESTMENT_ACTIVITY_LIST_ADAPTER, activity)
+
+
+@app.get("/investments/realized", response_model=list[InvestmentRealizedResponse])
+def list_realized_investments(
+    investment_id: int | None = None,
+    x_user_id: str | None = Header(None, alias="x-user-id"),
+) -> list[InvestmentRealizedResponse]:
     user_id = get_user_id(x_user_id)
-    conditions = [investment_entries.c.user_id == user_id]
+    conditions = [investment_entries.c.user_id == user_id, investment_entries.c.type == "sell"]
     if investment_id is not None:
         conditions.append(investment_entries.c.investment_id == investment_id)
     stmt = (
         select(
             investment_entries.c.id,
             investment_entries.c.investment_id,
-            investment_entries.c.transaction_id,
+            investment_entries.c.type,
             investment_entries.c.quantity,
             investment_entries.c.price,
             investment_entries.c.price_per_share,
             investment_entries.c.total_amount,
             investment_entries.c.currency,
+            investment_entries.c.cost_of_sold_shares,
             investment_entries.c.realized_profit_loss,
+            investment_entries.c.espp_period_id,
+            investment_entries.c.date,
             transactions.c.amount.label("transaction_amount"),
             transactions.c.currency.label("transaction_currency"),
-            investment_entries.c.type,
-            investment_entries.c.date,
-            investments.c.name.label("investment_name"),
-            investments.c.symbol.label("investment_symbol"),
-        )
-        .select_from(
-            investment_entries.join(
-                investments, investment_entries.c.investment_id == investments.c.id
-            ).join(
-                transactions,
-                (investment_entries.c.transaction_id == transactions.c.id)
-                & (investment_entries.c.user_id == transactions.c.user_id),
-            )
-        )
-        .where(*conditions)
-        .order_by(investment_entries.c.date.desc(), investment_entries.c.id.desc())
-    )
-    with engine.begin() as conn:
-        rows = conn.execute(stmt).mappings().all()
-    return [
-        InvestmentActivityResponse(
-            id=row["id"],
-            investment_id=row["investment_id"],
-            investment_name=row["investment_name"],
-            investment_symbol=row["investment_symbol"],
-            transaction_id=row["transaction_id"],
-            type=row["type"],
-            quantity=row["quantity"],
-            price=row["price"],
-            price_per_share=row["price_per_share"] or row["price"],
-            total_amount=row["total_amount"] or row["transaction_amount"],
-            currency=row["currency"] or row["transaction_currency"],
-            realized_profit_loss=row["realized_profit_loss"],
-            date=row["date"],
-        )
-        for row in rows
-    ]
-
-
-@app.get("/investments/realized", response_model=list[InvestmentRealizedResponse])
-def list_realized_investments(
-    investment_id: int | None = None,
-    x_user_id: str | None = Header(None, alias="x-user-id"),
-) -> list[InvestmentRealizedResponse]:
-    user_id = get_user_id(x_user_id)
-    conditions = [investment_entries.c.user_id == user_id, investment_entries.c.type == "sell"]
-    if investment_id is not None:
-        conditions.append(investment_entries.c.investment_id == investment_id)
-    stmt = (
-        select(
-            investment_entries.c.id,
-            investment_entries.c.investment_id,
-            investment_entries.c.type,
-            investment_entries.c.quantity,
-            investment_entries.c.price,
-            investment_entries.c.price_per_share,
-            investment_entries.c.total_amount,
-            investment_entries.c.currency,
-            investment_entries.c.cost_of_sold_shares,
-            investment_entries.c.realized_profit_loss,
-            investment_entries.c.espp_period_id,
-            investment_entries.c.date,
-            transactions.c.amount.label("transaction_amount"),
-            transactions.c.currency.label("transaction_currency"),
-            transactions.c.converted_at,
+            transactions.c.converted_at,
             investments.c.name.label("investment_name"),
             investments.c.symbol.label("investment_symbol"),
         )
@@ -2707,6 +3133,7 @@ def create_investment(
 
     if not row:
         raise HTTPException(status_code=500, detail="Failed to create investment.")
+    invalidate_list_response("investments", user_id)
     return InvestmentResponse(
         id=row["id"],
         user_id=row["user_id"],
@@ -2746,6 +3173,7 @@ def update_investment(
 
     if not row:
         raise HTTPException(status_code=404, detail="Investment not found.")
+    invalidate_list_response("investments", user_id)
     return InvestmentResponse(
         id=row["id"],
         user_id=row["user_id"],
@@ -2764,6 +3192,7 @@ def delete_investment(investment_id: int, x_user_id: str | None = Header(None, a
         result = conn.execute(stmt)
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Investment not found.")
+    invalidate_list_response("investments", user_id)
     return {"status": "deleted"}
 
 
@@ -2806,20 +3235,19 @@ def list_espp_batches(
         .order_by(espp_periods.c.start_date.desc(), espp_periods.c.id.desc())
     )
     with engine.begin() as conn:
-        rows = conn.execute(stmt).mappings().all()
-    return [
-        EsppBatchResponse(
-            period_id=row["period_id"],
-            period_name=row["period_name"],
-            stock_ticker=row["stock_ticker"],
-            stock_currency=row["stock_currency"],
-            purchase_date=row["purchase_date"],
-            shares_available=row["shares_available"],
-            purchase_price=row["purchase_price"],
-        )
-        for row in rows
-        if row["purchase_date"] is not None
-    ]
+        return [
+            EsppBatchResponse(
+                period_id=row["period_id"],
+                period_name=row["period_name"],
+                stock_ticker=row["stock_ticker"],
+                stock_currency=row["stock_currency"],
+                purchase_date=row["purchase_date"],
+                shares_available=row["shares_available"],
+                purchase_price=row["purchase_price"],
+            )
+            for row in conn.execute(stmt).mappings()
+            if row["purchase_date"] is not None
+        ]
 
 
 @app.get("/espp-batches/{period_id}/valuation", response_model=EsppBatchValuationResponse)
@@ -3090,10 +3518,12 @@ def close_espp_period(
 
         category_name = "ESPP"
         category_exists = conn.execute(
-            select(categories.c.id).where(
-                categories.c.user_id == user_id, categories.c.name == category_name
+            select(
+                exists().where(
+                    categories.c.user_id == user_id, categories.c.name == category_name
+                )
             )
-        ).mappings().first()
+        ).scalar()
         if not category_exists:
             conn.execute(
                 insert(categories).values(
@@ -3103,6 +3533,7 @@ def close_espp_period(
                 )
             )
 
+        investment_created = False
         investment_name = f"ESPP ({period_row['stock_ticker']})"
         investment_row = conn.execute(
             select(investments.c.id).where(
@@ -3120,6 +3551,7 @@ def close_espp_period(
                 )
                 .returning(investments.c.id)
             ).mappings().first()
+            investment_created = True
         if not investment_row:
             raise HTTPException(status_code=500, detail="Failed to create investment.")
         investment_id = investment_row["id"]
@@ -3206,6 +3638,10 @@ def close_espp_period(
             .values(status="closed")
         )
 
+    if not category_exists:
+        invalidate_category_groups(user_id)
+    if investment_created:
+        invalidate_list_response("investments", user_id)
     return EsppCloseResponse(
         period_id=period_id,
         status="closed",
@@ -3288,10 +3724,12 @@ def sell_espp_shares(
 
         category_name = "ESPP"
         category_exists = conn.execute(
-            select(categories.c.id).where(
-                categories.c.user_id == user_id, categories.c.name == category_name
+            select(
+                exists().where(
+                    categories.c.user_id == user_id, categories.c.name == category_name
+                )
             )
-        ).mappings().first()
+        ).scalar()
         if not category_exists:
             conn.execute(
                 insert(categories).values(
@@ -3301,6 +3739,7 @@ def sell_espp_shares(
                 )
             )
 
+        investment_created = False
         investment_name = f"ESPP ({period_row['stock_ticker']})"
         investment_row = conn.execute(
             select(investments.c.id).where(
@@ -3318,6 +3757,7 @@ def sell_espp_shares(
                 )
                 .returning(investments.c.id)
             ).mappings().first()
+            investment_created = True
         if not investment_row:
             raise HTTPException(status_code=500, detail="Failed to create investment.")
         investment_id = investment_row["id"]
@@ -3369,6 +3809,10 @@ def sell_espp_shares(
             .values(shares_available=max(remaining_shares, Decimal("0")))
         )
 
+    if not category_exists:
+        invalidate_category_groups(user_id)
+    if investment_created:
+        invalidate_list_response("investments", user_id)
     return EsppSellResponse(
         period_id=period_id,
         transaction_id=transaction_id,
@@ -4046,10 +4490,12 @@ def vest_rsu_vesting_period(
 
         category_name = "RSU"
         category_exists = conn.execute(
-            select(categories.c.id).where(
-                categories.c.user_id == user_id, categories.c.name == category_name
+            select(
+                exists().where(
+                    categories.c.user_id == user_id, categories.c.name == category_name
+                )
             )
-        ).mappings().first()
+        ).scalar()
         if not category_exists:
             conn.execute(
                 insert(categories).values(
@@ -4059,6 +4505,7 @@ def vest_rsu_vesting_period(
                 )
             )
 
+        investment_created = False
         investment_name = f"RSU ({grant_row['stock_ticker']})"
         investment_row = conn.execute(
             select(investments.c.id).where(
@@ -4076,6 +4523,7 @@ def vest_rsu_vesting_period(
                 )
                 .returning(investments.c.id)
             ).mappings().first()
+            investment_created = True
         if not investment_row:
             raise HTTPException(status_code=500, detail="Failed to create investment.")
         investment_id = investment_row["id"]
@@ -4164,6 +4612,10 @@ def vest_rsu_vesting_period(
             )
         ).mappings().first()
 
+    if not category_exists:
+        invalidate_category_groups(user_id)
+    if investment_created:
+        invalidate_list_response("investments", user_id)
     if not update_row:
         raise HTTPException(status_code=500, detail="Failed to update RSU vesting period.")
     return RsuVestingPeriodResponse(
@@ -4275,10 +4727,12 @@ def sell_rsu_shares(
 
         category_name = "RSU"
         category_exists = conn.execute(
-            select(categories.c.id).where(
-                categories.c.user_id == user_id, categories.c.name == category_name
+            select(
+                exists().where(
+                    categories.c.user_id == user_id, categories.c.name == category_name
+                )
             )
-        ).mappings().first()
+        ).scalar()
         if not category_exists:
             conn.execute(
                 insert(categories).values(
@@ -4288,6 +4742,7 @@ def sell_rsu_shares(
                 )
             )
 
+        investment_created = False
         investment_name = f"RSU ({grant_row['stock_ticker']})"
         investment_row = conn.execute(
             select(investments.c.id).where(
@@ -4305,6 +4760,7 @@ def sell_rsu_shares(
                 )
                 .returning(investments.c.id)
             ).mappings().first()
+            investment_created = True
         if not investment_row:
             raise HTTPException(status_code=500, detail="Failed to create investment.")
         investment_id = investment_row["id"]
@@ -4358,6 +4814,10 @@ def sell_rsu_shares(
             .values(shares_available=max(remaining_shares, Decimal("0")))
         )
 
+    if not category_exists:
+        invalidate_category_groups(user_id)
+    if investment_created:
+        invalidate_list_response("investments", user_id)
     return RsuSellResponse(
         period_id=period_id,
         transaction_id=transaction_id,
@@ -4372,31 +4832,38 @@ def sell_rsu_shares(
 @app.get("/recurring-schedules", response_model=list[RecurringScheduleResponse])
 def list_recurring_schedules(
     x_user_id: str | None = Header(None, alias="x-user-id"),
-) -> list[RecurringScheduleResponse]:
+    if_none_match: str | None = Header(None, alias="if-none-match"),
+) -> Response:
     user_id = get_user_id(x_user_id)
-    with engine.begin() as conn:
-        result = conn.execute(
-            select(pay_schedules)
-            .where(pay_schedules.c.user_id == user_id)
-            .order_by(pay_schedules.c.created_at.desc())
-        )
-        rows = result.mappings().all()
-    return [
-        RecurringScheduleResponse(
-            id=row["id"],
-            user_id=row["user_id"],
-            amount=row["amount"],
-            currency=row["currency"],
-            start_date=row["start_date"],
-            account_id=row["account_id"],
-            frequency=row["frequency"],
-            kind=row["kind"],
-            category_id=row["category_id"],
-            notes=row["notes"],
-            created_at=row["created_at"],
+
+    def build() -> bytes:
+        with read_conn() as conn:
+            result = conn.execute(
+                select(pay_schedules)
+                .where(pay_schedules.c.user_id == user_id)
+                .order_by(pay_schedules.c.created_at.desc())
+            )
+            rows = result.mappings().all()
+        return RECURRING_SCHEDULE_LIST_ADAPTER.dump_json(
+            [
+                RecurringScheduleResponse.model_construct(
+                    id=row["id"],
+                    user_id=row["user_id"],
+                    amount=row["amount"],
+                    currency=row["currency"],
+                    start_date=row["start_date"],
+                    account_id=row["account_id"],
+                    frequency=row["frequency"],
+                    kind=row["kind"],
+                    category_id=row["category_id"],
+                    notes=row["notes"],
+                    created_at=row["created_at"],
+                )
+                for row in rows
+            ]
         )
-        for row in rows
-    ]
+
+    return cached_list_response("recurring_schedules", user_id, if_none_match, build)
 
 
 @app.post("/recurring-schedules", response_model=RecurringScheduleResponse)
@@ -4460,6 +4927,7 @@ def create_recurring_schedule(
 
     if not row:
         raise HTTPException(status_code=500, detail="Failed to create recurring schedule.")
+    invalidate_list_response("recurring_schedules", user_id)
     return RecurringScheduleResponse(
         id=row["id"],
         user_id=row["user_id"],
@@ -4553,6 +5021,7 @@ def update_recurring_schedule(
 
     if not row:
         raise HTTPException(status_code=404, detail="Recurring schedule not found.")
+    invalidate_list_response("recurring_schedules", user_id)
     return RecurringScheduleResponse(
         id=row["id"],
         user_id=row["user_id"],
@@ -4580,76 +5049,98 @@ def delete_recurring_schedule(
         result = conn.execute(stmt)
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Recurring schedule not found.")
+    invalidate_list_response("recurring_schedules", user_id)
     return {"status": "deleted"}
 
 
+_LIST_TRANSACTIONS_STMT = (
+    select(
+        transactions,
+        investment_entries.c.investment_id,
+        investment_entries.c.quantity,
+        investment_entries.c.price,
+        investment_entries.c.type.label("investment_type"),
+    )
+    .select_from(
+        transactions.outerjoin(
+            investment_entries,
+            (investment_entries.c.transaction_id == transactions.c.id)
+            & (investment_entries.c.user_id == transactions.c.user_id),
+        )
+    )
+    .where(transactions.c.user_id == bindparam("uid"))
+    .order_by(transactions.c.date.desc(), transactions.c.id.desc())
+    .execution_options(yield_per=500)
+)
+_LIST_ACCOUNT_TRANSACTIONS_STMT = _LIST_TRANSACTIONS_STMT.where(
+    transactions.c.account_id == bindparam("account_id")
+)
+
+
 @app.get("/transactions", response_model=list[TransactionResponse])
 def list_transactions(
     account_id: int | None = None,
     x_user_id: str | None = Header(None, alias="x-user-id"),
-) -> list[TransactionResponse]:
+) -> Response:
     user_id = get_user_id(x_user_id)
-    conditions = [transactions.c.user_id == user_id]
-    if account_id is not None:
-        conditions.append(transactions.c.account_id == account_id)
-    join_stmt = transactions.outerjoin(
-        investment_entries,
-        (investment_entries.c.transaction_id == transactions.c.id)
-        & (investment_entries.c.user_id == transactions.c.user_id),
-    )
-    with engine.begin() as conn:
-        result = conn.execute(
-            select(
-                transactions,
-                investment_entries.c.investment_id,
-                investment_entries.c.quantity,
-                investment_entries.c.price,
-                investment_entries.c.type.label("investment_type"),
+    # yield_per uses a server-side (named) cursor on Postgres, which psycopg2
+    # refuses outside a transaction, so this can't use the AUTOCOMMIT read_conn.
+    with engine.connect() as conn:
+        if account_id is None:
+            result = conn.execute(_LIST_TRANSACTIONS_STMT, {"uid": user_id})
+        else:
+            result = conn.execute(
+                _LIST_ACCOUNT_TRANSACTIONS_STMT, {"uid": user_id, "account_id": account_id}
             )
-            .select_from(join_stmt)
-            .where(*conditions)
-            .order_by(transactions.c.date.desc(), transactions.c.id.desc())
-        )
-        rows = result.mappings().all()
-    return [
-        TransactionResponse(
-            id=row["id"],
-            user_id=row["user_id"],
-            account_id=row["account_id"],
-            amount=row["amount"],
-            currency=row["currency"],
-            type=row["type"],
-            category=row["category"],
-            date=row["date"],
-            notes=row["notes"],
-            investment_id=row["investment_id"],
-            quantity=row["quantity"],
-            price=row["price"],
-            investment_type=row["investment_type"],
-        )
-        for row in rows
-    ]
+        # Stream rows off a server-side cursor straight into the response
+        # models instead of buffering the full row list first.
+        items = [
+            TransactionResponse.model_construct(
+                id=row["id"],
+                user_id=row["user_id"],
+                account_id=row["account_id"],
+                amount=row["amount"],
+                currency=row["currency"],
+                type=row["type"],
+                category=row["category"],
+                date=row["date"],
+                notes=row["notes"],
+                investment_id=row["investment_id"],
+                quantity=row["quantity"],
+                price=row["price"],
+                investment_type=row["investment_type"],
+            )
+            for row in result.mappings()
+        ]
+    return json_list_response(TRANSACTION_LIST_ADAPTER, items)
+
+
+def parse_upload_csv(file: UploadFile) -> CSVParseResult:
+    # Decode and parse the spooled upload line by line instead of reading the
+    # whole file into bytes and then a second decoded string.
+    file.file.seek(0)
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        return parse_transactions_csv(stream)
+    finally:
+        stream.detach()
 
 
 @app.post("/transactions/parse-csv", response_model=CSVParseResult)
-async def parse_transactions(file: UploadFile = File(...)) -> CSVParseResult:
+def parse_transactions(file: UploadFile = File(...)) -> CSVParseResult:
     if not file.filename or not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail="CSV file required.")
 
-    contents = await file.read()
     try:
-        decoded = contents.decode("utf-8-sig")
+        return parse_upload_csv(file)
     except UnicodeDecodeError as exc:
         raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded.") from exc
-
-    try:
-        return parse_transactions_csv(decoded)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @app.post("/transactions/import/preview", response_model=TransactionImportPreviewResponse)
-async def preview_transaction_import(
+def preview_transaction_import(
     file: UploadFile = File(...),
     x_user_id: str | None = Header(None, alias="x-user-id"),
 ) -> TransactionImportPreviewResponse:
@@ -4657,25 +5148,30 @@ async def preview_transaction_import(
     if not file.filename or not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail="CSV file required.")
 
-    contents = await file.read()
     try:
-        decoded = contents.decode("utf-8-sig")
+        parse_result = parse_upload_csv(file)
     except UnicodeDecodeError as exc:
         raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded.") from exc
-
-    try:
-        parse_result = parse_transactions_csv(decoded)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    total_amount = sum((row.amount for row in parse_result.rows), Decimal("0"))
     return TransactionImportPreviewResponse(
         transactions=parse_result.rows,
         total_count=len(parse_result.rows),
-        total_amount=total_amount,
+        total_amount=parse_result.total_amount,
     )
 
 
+_OWNED_ACCOUNT_COUNT_STMT = (
+    select(func.count())
+    .select_from(accounts)
+    .where(
+        accounts.c.user_id == bindparam("uid"),
+        accounts.c.id.in_(bindparam("account_ids", expanding=True)),
+    )
+)
+
+
 @app.post("/transactions/import/commit", response_model=TransactionImportCommitResponse)
 def commit_transaction_import(
     payload: TransactionImportCommitPayload,
@@ -4734,18 +5230,21 @@ def commit_transaction_import(
     with engine.begin() as conn:
         default_currency = resolve_default_currency(conn, user_id)
         set_home_currency_if_missing(conn, user_id, default_currency)
-        for row in insert_rows:
-            row["currency"] = default_currency
-        account_rows = conn.execute(
-            select(accounts.c.id).where(
-                accounts.c.user_id == user_id,
-                accounts.c.id.in_(resolved_account_ids),
-            )
-        ).scalars().all()
-        if len(account_rows) != len(resolved_account_ids):
+        owned_account_count = conn.execute(
+            _OWNED_ACCOUNT_COUNT_STMT,
+            {"uid": user_id, "account_ids": list(resolved_account_ids)},
+        ).scalar_one()
+        if owned_account_count != len(resolved_account_ids):
             raise HTTPException(status_code=404, detail="Account not found.")
 
-        result = conn.execute(insert(transactions).returning(transactions.c.id), insert_rows)
+        for row in insert_rows:
+            row["currency"] = default_currency
+        result = conn.execute(
+            insert(transactions)
+            .returning(transactions.c.id)
+            .execution_options(insertmanyvalues_page_size=IMPORT_INSERT_BATCH_SIZE),
+            insert_rows,
+        )
         inserted_ids = [row[0] for row in result]
 
         # Learn patterns from newly imported transactions (async/non-blocking in real scenario)
@@ -4833,12 +5332,14 @@ def create_transaction(
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     with engine.begin() as conn:
-        account_exists = conn.execute(
-            select(accounts.c.id).where(accounts.c.id == payload.account_id, accounts.c.user_id == user_id)
-        ).first()
-        if not account_exists:
+        references = fetch_transaction_references(conn, user_id, payload)
+        if not references["account_exists"]:
             raise HTTPException(status_code=404, detail="Account not found.")
-        category_group = get_category_group(conn, user_id, payload.category)
+        category_group = (
+            get_category_groups(conn, user_id).get(payload.category)
+            if payload.category
+            else None
+        )
         try:
             resolved_currency = resolve_currency(payload.currency, conn, user_id)
         except ValueError as exc:
@@ -4850,15 +5351,8 @@ def create_transaction(
                 investment_entry = extract_investment_entry(payload)
             except ValueError as exc:
                 raise HTTPException(status_code=400, detail=str(exc)) from exc
-            if investment_entry:
-                investment_exists = conn.execute(
-                    select(investments.c.id).where(
-                        investments.c.id == investment_entry["investment_id"],
-                        investments.c.user_id == user_id,
-                    )
-                ).first()
-                if not investment_exists:
-                    raise HTTPException(status_code=404, detail="Investment not found.")
+            if investment_entry and not references["investment_exists"]:
+                raise HTTPException(status_code=404, detail="Investment not found.")
 
         stmt = (
             insert(transactions)
@@ -4939,28 +5433,17 @@ def update_transaction(
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     with engine.begin() as conn:
-        account_exists = conn.execute(
-            select(accounts.c.id).where(accounts.c.id == payload.account_id, accounts.c.user_id == user_id)
-        ).first()
-        if not account_exists:
+        references = fetch_transaction_references(conn, user_id, payload, transaction_id)
+        if not references["account_exists"]:
             raise HTTPException(status_code=404, detail="Account not found.")
-        existing_investment_entry = conn.execute(
-            select(investment_entries.c.id).where(
-                investment_entries.c.transaction_id == transaction_id,
-                investment_entries.c.user_id == user_id,
-            )
-        ).first()
-        if existing_investment_entry:
+        if references["has_investment_entry"]:
             raise HTTPException(status_code=400, detail="Investment transactions cannot be updated.")
-        category_group = get_category_group(conn, user_id, payload.category)
-        existing_currency = None
-        if payload.currency is None:
-            existing_currency = conn.execute(
-                select(transactions.c.currency).where(
-                    transactions.c.id == transaction_id,
-                    transactions.c.user_id == user_id,
-                )
-            ).scalar_one_or_none()
+        category_group = (
+            get_category_groups(conn, user_id).get(payload.category)
+            if payload.category
+            else None
+        )
+        existing_currency = references["existing_currency"]
         try:
             if payload.currency:
                 resolved_currency = normalize_currency(payload.currency)
@@ -4979,15 +5462,8 @@ def update_transaction(
                 investment_entry = extract_investment_entry(payload)
             except ValueError as exc:
                 raise HTTPException(status_code=400, detail=str(exc)) from exc
-            if investment_entry:
-                investment_exists = conn.execute(
-                    select(investments.c.id).where(
-                        investments.c.id == investment_entry["investment_id"],
-                        investments.c.user_id == user_id,
-                    )
-                ).first()
-                if not investment_exists:
-                    raise HTTPException(status_code=404, detail="Investment not found.")
+            if investment_entry and not references["investment_exists"]:
+                raise HTTPException(status_code=404, detail="Investment not found.")
 
         stmt = (
             update(transactions)
@@ -5016,45 +5492,29 @@ def update_transaction(
         result = conn.execute(stmt)
         row = result.mappings().first()
         if row and investment_entry:
-            existing_entry = conn.execute(
-                select(investment_entries.c.id).where(
-                    investment_entries.c.transaction_id == transaction_id,
-                    investment_entries.c.user_id == user_id,
-                )
-            ).first()
-            if existing_entry:
-                conn.execute(
-                    update(investment_entries)
-                    .where(investment_entries.c.id == existing_entry[0])
-                    .values(
-                        investment_id=investment_entry["investment_id"],
-                        quantity=investment_entry["quantity"],
-                        price=investment_entry["price"],
-                        price_per_share=investment_entry["price"],
-                        total_amount=investment_entry["total_amount"],
-                        currency=resolved_currency,
-                        source="regular",
-                        espp_period_id=None,
-                        type=investment_entry["type"],
-                        date=payload.date,
-                    )
-                )
-            else:
-                conn.execute(
-                    insert(investment_entries).values(
-                        user_id=user_id,
-                        investment_id=investment_entry["investment_id"],
-                        transaction_id=transaction_id,
-                        quantity=investment_entry["quantity"],
-                        price=investment_entry["price"],
-                        price_per_share=investment_entry["price"],
-                        total_amount=investment_entry["total_amount"],
-                        currency=resolved_currency,
-                        source="regular",
-                        type=investment_entry["type"],
-                        date=payload.date,
-                    )
+            entry_values = {
+                "investment_id": investment_entry["investment_id"],
+                "quantity": investment_entry["quantity"],
+                "price": investment_entry["price"],
+                "price_per_share": investment_entry["price"],
+                "total_amount": investment_entry["total_amount"],
+                "currency": resolved_currency,
+                "source": "regular",
+                "espp_period_id": None,
+                "type": investment_entry["type"],
+                "date": payload.date,
+            }
+            # Updates are refused above once an entry exists, so the DO UPDATE
+            # arm only fires if a concurrent request inserted one meanwhile.
+            upsert = dialect_insert(investment_entries).values(
+                user_id=user_id, transaction_id=transaction_id, **entry_values
+            )
+            conn.execute(
+                upsert.on_conflict_do_update(
+                    index_elements=[investment_entries.c.transaction_id],
+                    set_=entry_values,
                 )
+            )
             try:
                 recalculate_investment_position(conn, user_id, investment_entry["investment_id"])
             except ValueError as exc:
@@ -5231,32 +5691,31 @@ def income_projections(
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="Start date must be on or before end date.")
 
-    with engine.begin() as conn:
-        income_rows = conn.execute(
-            select(
-                transactions.c.date,
-                transactions.c.amount,
-                transactions.c.account_id,
-                transactions.c.notes,
-            ).where(
-                transactions.c.user_id == user_id,
-                transactions.c.type == "income",
-                transactions.c.date >= start_date,
-                transactions.c.date <= end_date,
-            )
-        ).mappings().all()
-        schedule_rows = conn.execute(
-            select(
-                pay_schedules.c.amount,
-                pay_schedules.c.start_date,
-                pay_schedules.c.account_id,
-                pay_schedules.c.frequency,
-                pay_schedules.c.notes,
-            ).where(
-                pay_schedules.c.user_id == user_id,
-                pay_schedules.c.kind == "income",
-            )
-        ).mappings().all()
+    income_rows, schedule_rows = fetch_all_concurrently(
+        select(
+            transactions.c.date,
+            transactions.c.amount,
+            transactions.c.account_id,
+            transactions.c.notes,
+        )
+        .where(
+            transactions.c.user_id == user_id,
+            transactions.c.type == "income",
+            transactions.c.date >= start_date,
+            transactions.c.date <= end_date,
+        )
+        .order_by(transactions.c.account_id, transactions.c.date),
+        select(
+            pay_schedules.c.amount,
+            pay_schedules.c.start_date,
+            pay_schedules.c.account_id,
+            pay_schedules.c.frequency,
+            pay_schedules.c.notes,
+        ).where(
+            pay_schedules.c.user_id == user_id,
+            pay_schedules.c.kind == "income",
+        ),
+    )
 
     actual_entries = [
         IncomeProjectionEntry(
@@ -5269,15 +5728,23 @@ def income_projections(
         for row in income_rows
     ]
 
-    income_by_account: dict[int, list[IncomeTransaction]] = {}
-    for row in income_rows:
-        income_by_account.setdefault(row["account_id"], []).append(
+    # Rows arrive grouped by account; only accounts with an income schedule
+    # need IncomeTransaction matches for their projections.
+    schedule_accounts = {row["account_id"] for row in schedule_rows}
+    income_by_account: dict[int, list[IncomeTransaction]] = {
+        account_id: [
             IncomeTransaction(
                 date=row["date"],
                 amount=row["amount"],
                 account_id=row["account_id"],
             )
+            for row in account_rows
+        ]
+        for account_id, account_rows in itertools.groupby(
+            income_rows, key=lambda row: row["account_id"]
         )
+        if account_id in schedule_accounts
+    }
 
     projected_entries: list[IncomeProjectionEntry] = []
     for row in schedule_rows:
@@ -5314,35 +5781,37 @@ def recurring_projections(
     start_date: date = Query(...),
     end_date: date = Query(...),
     x_user_id: str | None = Header(None, alias="x-user-id"),
-) -> list[RecurringProjectionEntry]:
+) -> Response:
     user_id = get_user_id(x_user_id)
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="Start date must be on or before end date.")
 
-    with engine.begin() as conn:
-        existing_rows = conn.execute(
-            select(
-                transactions.c.date,
-                transactions.c.account_id,
-                transactions.c.type,
-            ).where(
-                transactions.c.user_id == user_id,
-                transactions.c.type.in_(("income", "expense", "investment")),
-                transactions.c.date >= start_date,
-                transactions.c.date <= end_date,
-            )
-        ).mappings().all()
-        schedule_rows = conn.execute(
-            select(
-                pay_schedules.c.id,
-                pay_schedules.c.amount,
-                pay_schedules.c.start_date,
-                pay_schedules.c.account_id,
-                pay_schedules.c.frequency,
-                pay_schedules.c.kind,
-                pay_schedules.c.notes,
-            ).where(pay_schedules.c.user_id == user_id)
-        ).mappings().all()
+    # The EXISTS guard lets the database skip the transaction scan for users
+    # without schedules while both queries still run concurrently.
+    existing_rows, schedule_rows = fetch_all_concurrently(
+        select(
+            transactions.c.date,
+            transactions.c.account_id,
+            transactions.c.type,
+        ).where(
+            exists().where(pay_schedules.c.user_id == user_id),
+            transactions.c.user_id == user_id,
+            transactions.c.type.in_(("income", "expense", "investment")),
+            transactions.c.date >= start_date,
+            transactions.c.date <= end_date,
+        ),
+        select(
+            pay_schedules.c.id,
+            pay_schedules.c.amount,
+            pay_schedules.c.start_date,
+            pay_schedules.c.account_id,
+            pay_schedules.c.frequency,
+            pay_schedules.c.kind,
+            pay_schedules.c.notes,
+        ).where(pay_schedules.c.user_id == user_id),
+    )
+    if not schedule_rows:
+        return json_list_response(RECURRING_PROJECTION_LIST_ADAPTER, [])
 
     existing_transactions = [
         ActualTransaction(
@@ -5353,7 +5822,10 @@ def recurring_projections(
         for row in existing_rows
     ]
 
-    projections: list[RecurringProjectionEntry] = []
+    # Each schedule yields its projections in date order, so k-way merge the
+    # per-schedule runs on (date, schedule_id) packed into one int and only
+    # build response models once the order is known.
+    schedule_runs: list[list[tuple[int, ProjectedEntry, RowMapping]]] = []
     for row in schedule_rows:
         schedule = RecurringSchedule(
             amount=row["amount"],
@@ -5369,20 +5841,26 @@ def recurring_projections(
             )
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
-        projections.extend(
-            RecurringProjectionEntry(
-                date=projection.date,
-                amount=projection.amount,
-                kind=row["kind"],
-                schedule_id=row["id"],
-                source=projection.source,
-                notes=projection.notes,
-            )
-            for projection in schedule_projections
+        schedule_id = row["id"]
+        schedule_runs.append(
+            [
+                (projection.date.toordinal() << 32 | schedule_id, projection, row)
+                for projection in schedule_projections
+            ]
+        )
+
+    projections = [
+        RecurringProjectionEntry.model_construct(
+            date=projection.date,
+            amount=projection.amount,
+            kind=row["kind"],
+            schedule_id=row["id"],
+            source=projection.source,
+            notes=projection.notes,
         )
-
-    projections.sort(key=lambda entry: (entry.date, entry.schedule_id))
-    return projections
+        for _, projection, row in heapq.merge(*schedule_runs, key=operator.itemgetter(0))
+    ]
+    return json_list_response(RECURRING_PROJECTION_LIST_ADAPTER, projections)
 
 
 @app.get(
@@ -5404,15 +5882,20 @@ def monthly_trends(
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="Start date must be on or before end date.")
 
+    # Months as year * 12 + month - 1; EXTRACT compiles on both PostgreSQL and
+    # SQLite, unlike date_trunc.
+    month_index_expr = (
+        extract("year", transactions.c.date) * 12 + extract("month", transactions.c.date) - 1
+    )
     with engine.begin() as conn:
         home_currency = resolve_default_currency(conn, user_id)
         rows = conn.execute(
             select(
-                transactions.c.date,
-                transactions.c.amount,
+                month_index_expr.label("month_index"),
                 transactions.c.currency,
                 transactions.c.type,
                 categories.c.group.label("category_group"),
+                func.sum(transactions.c.amount).label("amount"),
             )
             .select_from(
                 transactions.outerjoin(
@@ -5426,37 +5909,15 @@ def monthly_trends(
                 transactions.c.date >= start_date,
                 transactions.c.date <= end_date,
             )
+            .group_by(
+                month_index_expr,
+                transactions.c.currency,
+                transactions.c.type,
+                categories.c.group,
+            )
+            .order_by(month_index_expr)
         ).mappings().all()
 
-    totals_by_month: dict[str, dict[str, object]] = {}
-    for row in rows:
-        month_key = row["date"].strftime("%Y-%m")
-        entry = totals_by_month.setdefault(
-            month_key,
-            {
-                "income": {},
-                "regular_expenses": {},
-                "investment_expenses": {},
-                "source_currencies": set(),
-            },
-        )
-        currency = safe_normalize_currency(row["currency"], home_currency)
-        entry["source_currencies"].add(currency)
-        amount = coerce_decimal(row["amount"])
-        txn_type = row["type"].strip().lower()
-        if txn_type == "income":
-            entry["income"][currency] = entry["income"].get(currency, Decimal("0")) + amount
-        elif txn_type == "expense":
-            category_group = row["category_group"]
-            if category_group and category_group.strip().lower() == "investments":
-                entry["investment_expenses"][currency] = (
-                    entry["investment_expenses"].get(currency, Decimal("0")) + amount
-                )
-            else:
-                entry["regular_expenses"][currency] = (
-                    entry["regular_expenses"].get(currency, Decimal("0")) + amount
-                )
-
     projected_totals_by_month: dict[str, dict[str, Decimal]] = {}
     projected_current_month_by_month: dict[str, dict[str, Decimal]] = {}
     projected_source_currencies_by_month: dict[str, set[str]] = {}
@@ -5567,26 +6028,45 @@ def monthly_trends(
                 projected_next_currencies
             )
 
+    # Rows are ordered by month, so each month consumes the next run of rows
+    # from a single pass instead of bucketing everything by month first.
+    row_iter = iter(rows)
+    row = next(row_iter, None)
     results: list[MonthlyTrendResponse] = []
     for month_value in iter_months(start_date, end_date):
-        key = month_value.strftime("%Y-%m")
-        totals = totals_by_month.get(
-            key,
-            {
-                "income": {},
-                "regular_expenses": {},
-                "investment_expenses": {},
-                "source_currencies": set(),
-            },
-        )
-        income, income_currencies = sum_converted_amounts(
-            totals["income"], home_currency
-        )
+        key = f"{month_value.year:04d}-{month_value.month:02d}"
+        month_index = month_value.year * 12 + month_value.month - 1
+        income_by_currency: dict[str, Decimal] = {}
+        regular_by_currency: dict[str, Decimal] = {}
+        investment_by_currency: dict[str, Decimal] = {}
+        source_currencies: set[str] = set()
+        while row is not None and int(row["month_index"]) <= month_index:
+            currency = safe_normalize_currency(row["currency"], home_currency)
+            source_currencies.add(currency)
+            amount = coerce_decimal(row["amount"])
+            txn_type = row["type"].strip().lower()
+            if txn_type == "income":
+                income_by_currency[currency] = (
+                    income_by_currency.get(currency, DECIMAL_ZERO) + amount
+                )
+            elif txn_type == "expense":
+                category_group = row["category_group"]
+                if category_group and category_group.strip().lower() == "investments":
+                    investment_by_currency[currency] = (
+                        investment_by_currency.get(currency, DECIMAL_ZERO) + amount
+                    )
+                else:
+                    regular_by_currency[currency] = (
+                        regular_by_currency.get(currency, DECIMAL_ZERO) + amount
+                    )
+            row = next(row_iter, None)
+
+        income, income_currencies = sum_converted_amounts(income_by_currency, home_currency)
         regular_expenses, regular_expense_currencies = sum_converted_amounts(
-            totals["regular_expenses"], home_currency
+            regular_by_currency, home_currency
         )
         investment_expenses, investment_expense_currencies = sum_converted_amounts(
-            totals["investment_expenses"], home_currency
+            investment_by_currency, home_currency
         )
         expenses = regular_expenses + investment_expenses
         projected_totals = projected_totals_by_month.get(key, {})
@@ -5607,7 +6087,6 @@ def monthly_trends(
             (projected_current_regular_expenses or Decimal("0"))
             + (projected_current_investment_expenses or Decimal("0"))
         )
-        source_currencies = set(totals["source_currencies"])
         source_currencies.update(income_currencies)
         source_currencies.update(regular_expense_currencies)
         source_currencies.update(investment_expense_currencies)
@@ -5616,7 +6095,7 @@ def monthly_trends(
             projected_current_source_currencies_by_month.get(key, set())
         )
         results.append(
-            MonthlyTrendResponse(
+            MonthlyTrendResponse.model_construct(
                 month=key,
                 total_income=income,
                 total_expenses=expenses,
@@ -5710,7 +6189,7 @@ def net_flow_summary(
     if previous_count > 0 and previous_net_flow != 0:
         percentage_change = (
             (current_net_flow - previous_net_flow) / abs(previous_net_flow)
-        ) * Decimal("100")
+        ) * PERCENT_SCALE
 
     return NetFlowSummaryResponse(
         net_flow_current_month=current_net_flow,
@@ -6137,7 +6616,7 @@ def net_worth_report(
         )
         if currency:
             balances = entry["balances"]
-            balances[currency] = balances.get(currency, Decimal("0")) + balance
+            balances[currency] = balances.get(currency, DECIMAL_ZERO) + balance
 
     for entry in balances_by_account.values():
         balances = entry["balances"]
@@ -6211,6 +6690,25 @@ def net_worth_report(
     )
 
 
+_BREAKDOWN_CATEGORY_EXPR = func.coalesce(transactions.c.category, "Uncategorized").label(
+    "category"
+)
+_CATEGORY_BREAKDOWN_STMT = (
+    select(
+        _BREAKDOWN_CATEGORY_EXPR,
+        transactions.c.currency,
+        func.coalesce(func.sum(transactions.c.amount), 0).label("total_spent"),
+    )
+    .where(
+        transactions.c.user_id == bindparam("uid"),
+        transactions.c.type == "expense",
+        transactions.c.date >= bindparam("start_date"),
+        transactions.c.date <= bindparam("end_date"),
+    )
+    .group_by(_BREAKDOWN_CATEGORY_EXPR, transactions.c.currency)
+)
+
+
 @app.get("/reports/category-breakdown", response_model=list[CategoryBreakdownResponse])
 def category_breakdown(
     start_date: date | None = Query(None),
@@ -6226,30 +6724,21 @@ def category_breakdown(
     if start_date > end_date:
         raise HTTPException(status_code=400, detail="Start date must be on or before end date.")
 
-    category_expr = func.coalesce(transactions.c.category, "Uncategorized").label("category")
-    total_spent_expr = func.coalesce(func.sum(transactions.c.amount), 0).label("total_spent")
-    stmt = (
-        select(category_expr, transactions.c.currency, total_spent_expr)
-        .where(
-            transactions.c.user_id == user_id,
-            transactions.c.type == "expense",
-            transactions.c.date >= start_date,
-            transactions.c.date <= end_date,
-        )
-        .group_by(category_expr, transactions.c.currency)
-    )
-
-    with engine.begin() as conn:
+    with read_conn() as conn:
         home_currency = resolve_default_currency(conn, user_id)
-        rows = conn.execute(stmt).mappings().all()
+        rows = conn.execute(
+            _CATEGORY_BREAKDOWN_STMT,
+            {"uid": user_id, "start_date": start_date, "end_date": end_date},
+        ).mappings().all()
 
+    # total_spent is typed Numeric, so SQLAlchemy already hands back Decimal
+    # on every backend and the rows need no per-value coercion.
     totals_by_category: dict[str, dict[str, Decimal]] = {}
     source_currencies_by_category: dict[str, set[str]] = {}
     for row in rows:
         category = row["category"]
         currency = safe_normalize_currency(row["currency"], home_currency)
-        totals_by_category.setdefault(category, {})
-        totals_by_category[category][currency] = coerce_decimal(row["total_spent"])
+        totals_by_category.setdefault(category, {})[currency] = row["total_spent"]
         source_currencies_by_category.setdefault(category, set()).add(currency)
 
     converted_totals: dict[str, Decimal] = {}
@@ -6262,23 +6751,20 @@ def category_breakdown(
     if total_spent_converted <= 0:
         return []
 
-    results: list[CategoryBreakdownResponse] = []
-    for category, total_value in sorted(
-        converted_totals.items(), key=lambda item: item[1], reverse=True
-    ):
-        percentage = (total_value / total_spent_converted) * Decimal("100")
-        results.append(
-            CategoryBreakdownResponse(
-                category=category,
-                total_spent=total_value,
-                percentage_of_total=percentage,
-                home_currency=home_currency,
-                source_currencies=sorted(source_currencies_by_category.get(category, set()))
-                if source_currencies_by_category.get(category)
-                else None,
-            )
+    return [
+        CategoryBreakdownResponse.model_construct(
+            category=category,
+            total_spent=total_value,
+            percentage_of_total=(total_value / total_spent_converted) * PERCENT_SCALE,
+            home_currency=home_currency,
+            source_currencies=sorted(source_currencies_by_category.get(category, set()))
+            if source_currencies_by_category.get(category)
+            else None,
+        )
+        for category, total_value in sorted(
+            converted_totals.items(), key=lambda item: item[1], reverse=True
         )
-    return results
+    ]
 
 
 @app.get(
@@ -6300,26 +6786,20 @@ def monthly_expense_groups(
     start_date = month_start(month_date)
     end_date = month_end(month_date)
 
-    with engine.begin() as conn:
+    with read_conn() as conn:
         home_currency = resolve_default_currency(conn, user_id)
-    totals, source_currencies = fetch_expense_group_totals(
-        user_id, start_date, end_date, home_currency
-    )
-    income_by_currency = fetch_totals_by_currency(
-        user_id, start_date, end_date, "income"
-    )
-    income_total, income_currencies = sum_converted_amounts(
-        income_by_currency, home_currency
-    )
+        totals, source_currencies = fetch_period_totals(
+            conn, user_id, start_date, end_date, home_currency
+        )
     # TODO: Merge projected income/expense totals once forecast pipeline lands.
     return MonthlyExpenseGroupResponse(
         month=month_date.strftime("%Y-%m"),
-        income_total=income_total,
+        income_total=totals["income"],
         needs_total=totals["needs"],
         wants_total=totals["wants"],
         investments_total=totals["investments"],
         home_currency=home_currency,
-        income_source_currencies=income_currencies if income_currencies else None,
+        income_source_currencies=source_currencies["income"] or None,
         needs_source_currencies=source_currencies.get("needs"),
         wants_source_currencies=source_currencies.get("wants"),
         investments_source_currencies=source_currencies.get("investments"),
@@ -6463,7 +6943,7 @@ def category_trends(
         currency = safe_normalize_currency(row["currency"], home_currency)
         entry["source_currencies"].add(currency)
         converted_amount = convert_amount_safe(row["amount"], currency, home_currency)
-        entry["totals"][category] = entry["totals"].get(category, Decimal("0")) + converted_amount
+        entry["totals"][category] = entry["totals"].get(category, DECIMAL_ZERO) + converted_amount
 
     buckets: list[CategoryTrendBucket] = []
     cursor = get_report_bucket_start(range_start, resolution)
@@ -6489,30 +6969,45 @@ def category_trends(
     )
 
 
+_LIST_RULES_STMT = (
+    select(budget_rules)
+    .where(budget_rules.c.user_id == bindparam("uid"))
+    .order_by(budget_rules.c.created_at.desc(), budget_rules.c.id.desc())
+)
+_EVAL_RULES_STMT = select(budget_rules).where(budget_rules.c.user_id == bindparam("uid"))
+_EVAL_TOTALS_STMT = (
+    select(
+        transactions.c.type,
+        transactions.c.category,
+        transactions.c.account_id,
+        transactions.c.currency,
+        func.sum(transactions.c.amount).label("total"),
+    )
+    .where(
+        transactions.c.user_id == bindparam("uid"),
+        transactions.c.date >= bindparam("start_date"),
+        transactions.c.date <= bindparam("end_date"),
+    )
+    .group_by(
+        transactions.c.type,
+        transactions.c.category,
+        transactions.c.account_id,
+        transactions.c.currency,
+    )
+)
+
+
 @app.get("/budget/rules", response_model=list[BudgetRuleResponse])
 def list_budget_rules(
     x_user_id: str | None = Header(None, alias="x-user-id"),
 ) -> list[BudgetRuleResponse]:
     user_id = get_user_id(x_user_id)
-    with engine.begin() as conn:
-        result = conn.execute(
-            select(budget_rules)
-            .where(budget_rules.c.user_id == user_id)
-            .order_by(budget_rules.c.created_at.desc(), budget_rules.c.id.desc())
-        )
-        rows = result.mappings().all()
-    return [
-        BudgetRuleResponse(
-            id=row["id"],
-            user_id=row["user_id"],
-            rule_type=row["rule_type"],
-            amount=row["amount"],
-            category=row["category"],
-            account_id=row["account_id"],
-            created_at=row["created_at"],
-        )
-        for row in rows
-    ]
+    # Rows come straight from the budget_rules table, so skip re-validating them.
+    with read_conn() as conn:
+        return [
+            BudgetRuleResponse.model_construct(**row)
+            for row in conn.execute(_LIST_RULES_STMT, {"uid": user_id}).mappings()
+        ]
 
 
 @app.post("/budget/rules", response_model=BudgetRuleResponse)
@@ -6520,43 +7015,41 @@ def create_budget_rule(
     payload: BudgetRulePayload, x_user_id: str | None = Header(None, alias="x-user-id")
 ) -> BudgetRuleResponse:
     user_id = get_user_id(x_user_id)
-    try:
-        payload = BudgetRulePayload.validate_payload(payload)
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
+    if payload.account_id is None:
+        stmt = insert(budget_rules).values(
+            user_id=user_id,
+            rule_type=payload.rule_type,
+            amount=payload.amount,
+            category=payload.category,
+            account_id=payload.account_id,
+        )
+    else:
+        # Insert through a select over the user's own accounts so the ownership
+        # check and the write share one round trip; no row means no account.
+        stmt = insert(budget_rules).from_select(
+            ["user_id", "rule_type", "amount", "account_id"],
+            select(
+                literal(user_id, Integer),
+                literal(payload.rule_type, String),
+                literal(payload.amount, Numeric(12, 2)),
+                accounts.c.id,
+            ).where(accounts.c.id == payload.account_id, accounts.c.user_id == user_id),
+        )
+    stmt = stmt.returning(
+        budget_rules.c.id,
+        budget_rules.c.user_id,
+        budget_rules.c.rule_type,
+        budget_rules.c.amount,
+        budget_rules.c.category,
+        budget_rules.c.account_id,
+        budget_rules.c.created_at,
+    )
     with engine.begin() as conn:
-        if payload.account_id is not None:
-            account_exists = conn.execute(
-                select(accounts.c.id).where(
-                    accounts.c.id == payload.account_id, accounts.c.user_id == user_id
-                )
-            ).first()
-            if not account_exists:
-                raise HTTPException(status_code=404, detail="Account not found.")
-
-        stmt = (
-            insert(budget_rules)
-            .values(
-                user_id=user_id,
-                rule_type=payload.rule_type,
-                amount=payload.amount,
-                category=payload.category,
-                account_id=payload.account_id,
-            )
-            .returning(
-                budget_rules.c.id,
-                budget_rules.c.user_id,
-                budget_rules.c.rule_type,
-                budget_rules.c.amount,
-                budget_rules.c.category,
-                budget_rules.c.account_id,
-                budget_rules.c.created_at,
-            )
-        )
-        result = conn.execute(stmt)
-        row = result.mappings().first()
+        row = conn.execute(stmt).mappings().first()
 
+    if not row and payload.account_id is not None:
+        raise HTTPException(status_code=404, detail="Account not found.")
     if not row:
         raise HTTPException(status_code=500, detail="Failed to create budget rule.")
     return BudgetRuleResponse(
@@ -6577,24 +7070,21 @@ def update_budget_rule(
     x_user_id: str | None = Header(None, alias="x-user-id"),
 ) -> BudgetRuleResponse:
     user_id = get_user_id(x_user_id)
-    try:
-        payload = BudgetRulePayload.validate_payload(payload)
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    with engine.begin() as conn:
-        if payload.account_id is not None:
-            account_exists = conn.execute(
-                select(accounts.c.id).where(
-                    accounts.c.id == payload.account_id, accounts.c.user_id == user_id
-                )
-            ).first()
-            if not account_exists:
-                raise HTTPException(status_code=404, detail="Account not found.")
+    conditions = [budget_rules.c.id == rule_id, budget_rules.c.user_id == user_id]
+    account_owned = None
+    if payload.account_id is not None:
+        # Check account ownership inside the UPDATE; only a miss pays for a
+        # second query to tell a missing account from a missing rule.
+        account_owned = exists().where(
+            accounts.c.id == payload.account_id, accounts.c.user_id == user_id
+        )
+        conditions.append(account_owned)
 
+    with engine.begin() as conn:
         stmt = (
             update(budget_rules)
-            .where(budget_rules.c.id == rule_id, budget_rules.c.user_id == user_id)
+            .where(*conditions)
             .values(
                 rule_type=payload.rule_type,
                 amount=payload.amount,
@@ -6613,6 +7103,9 @@ def update_budget_rule(
         )
         result = conn.execute(stmt)
         row = result.mappings().first()
+        if not row and account_owned is not None:
+            if not conn.execute(select(account_owned)).scalar():
+                raise HTTPException(status_code=404, detail="Account not found.")
 
     if not row:
         raise HTTPException(status_code=404, detail="Budget rule not found.")
@@ -6632,12 +7125,13 @@ def delete_budget_rule(
     rule_id: int, x_user_id: str | None = Header(None, alias="x-user-id")
 ) -> dict:
     user_id = get_user_id(x_user_id)
-    stmt = budget_rules.delete().where(
-        budget_rules.c.id == rule_id, budget_rules.c.user_id == user_id
+    stmt = (
+        budget_rules.delete()
+        .where(budget_rules.c.id == rule_id, budget_rules.c.user_id == user_id)
+        .returning(budget_rules.c.id)
     )
     with engine.begin() as conn:
-        result = conn.execute(stmt)
-        if result.rowcount == 0:
+        if conn.execute(stmt).first() is None:
             raise HTTPException(status_code=404, detail="Budget rule not found.")
     return {"status": "deleted"}
 
@@ -6646,7 +7140,7 @@ def delete_budget_rule(
 def evaluate_budget_rules(
     period: str = Query(...),
     x_user_id: str | None = Header(None, alias="x-user-id"),
-) -> list[BudgetEvaluationResponse]:
+) -> Response:
     user_id = get_user_id(x_user_id)
     today = date.today()
     try:
@@ -6654,33 +7148,26 @@ def evaluate_budget_rules(
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-    with engine.begin() as conn:
-        home_currency = resolve_default_currency(conn, user_id)
-        rule_rows = conn.execute(
-            select(budget_rules).where(budget_rules.c.user_id == user_id)
-        ).mappings().all()
-        txn_rows = conn.execute(
-            select(transactions).where(
-                transactions.c.user_id == user_id,
-                transactions.c.date >= start_date,
-                transactions.c.date <= end_date,
-            )
-        ).mappings().all()
-
     source_currencies: set[str] = set()
-    txn_items = []
-    for row in txn_rows:
-        currency = safe_normalize_currency(row["currency"], home_currency)
-        source_currencies.add(currency)
-        txn_items.append(
-            Transaction(
-                amount=convert_amount_safe(row["amount"], currency, home_currency),
-                type=row["type"],
-                date=row["date"],
-                category=row["category"],
-                account_id=row["account_id"],
+    totals = BudgetTotals()
+    with read_conn() as conn:
+        rule_rows = conn.execute(_EVAL_RULES_STMT, {"uid": user_id}).mappings().all()
+        if not rule_rows:
+            return json_list_response(BUDGET_EVALUATION_LIST_ADAPTER, [])
+        home_currency = resolve_default_currency(conn, user_id)
+        total_rows = conn.execute(
+            _EVAL_TOTALS_STMT,
+            {"uid": user_id, "start_date": start_date, "end_date": end_date},
+        ).mappings()
+        for row in total_rows:
+            currency = safe_normalize_currency(row["currency"], home_currency)
+            source_currencies.add(currency)
+            totals.add(
+                row["type"],
+                convert_amount_safe(row["total"] or 0, currency, home_currency),
+                row["category"],
+                row["account_id"],
             )
-        )
 
     evaluations: list[BudgetEvaluationResponse] = []
     for row in rule_rows:
@@ -6691,14 +7178,14 @@ def evaluate_budget_rules(
             account_id=row["account_id"],
         )
         try:
-            result = evaluate_budget(txn_items, rule, start_date, end_date)
+            result = evaluate_budget_totals(totals, rule)
         except ValueError as exc:
             raise HTTPException(
                 status_code=400,
                 detail=f"Invalid budget rule {row['id']}: {exc}",
             ) from exc
         evaluations.append(
-            BudgetEvaluationResponse(
+            BudgetEvaluationResponse.model_construct(
                 rule_id=row["id"],
                 rule_type=row["rule_type"],
                 amount=row["amount"],
@@ -6714,4 +7201,4 @@ def evaluate_budget_rules(
                 source_currencies=sorted(source_currencies) if source_currencies else None,
             )
         )
-    return evaluations
+    return json_list_response(BUDGET_EVALUATION_LIST_ADAPTER, evaluations)
@@ -0,0 +1,3 @@
+-- Index category lookups used when checking whether a category is in use
+CREATE INDEX IF NOT EXISTS idx_transactions_user_category ON transactions(user_id, category);
+CREATE INDEX IF NOT EXISTS idx_budget_rules_user_category ON budget_rules(user_id, category);
@@ -0,0 +1,4 @@
+-- Cover per-user period aggregates filtered by type and date range
+CREATE INDEX IF NOT EXISTS idx_transactions_user_type_date
+    ON transactions(user_id, type, date) INCLUDE (amount, category, account_id, currency);
+CREATE INDEX IF NOT EXISTS idx_categories_user_name_group ON categories(user_id, name, "group");
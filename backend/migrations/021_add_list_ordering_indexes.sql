@@ -0,0 +1,11 @@
+-- Match the per-user list endpoints' ORDER BY so they read in index order
+CREATE INDEX IF NOT EXISTS idx_transactions_user_date_id
+    ON transactions(user_id, date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_investments_user_created_at
+    ON investments(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_pay_schedules_user_created_at
+    ON pay_schedules(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_investment_entries_user_date_id
+    ON investment_entries(user_id, date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_investment_entries_user_investment_date_id
+    ON investment_entries(user_id, investment_id, date DESC, id DESC);
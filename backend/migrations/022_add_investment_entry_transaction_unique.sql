@@ -0,0 +1,23 @@
+-- One investment entry per transaction; update_transaction upserts on it.
+-- Entries feed the investment positions, so duplicates are not deleted here:
+-- the migration stops and lists them for manual resolution.
+DO $$
+DECLARE
+    duplicate_ids TEXT;
+BEGIN
+    SELECT string_agg(transaction_id::TEXT, ', ' ORDER BY transaction_id)
+    INTO duplicate_ids
+    FROM (
+        SELECT transaction_id
+        FROM investment_entries
+        GROUP BY transaction_id
+        HAVING COUNT(*) > 1
+    ) AS duplicates;
+
+    IF duplicate_ids IS NOT NULL THEN
+        RAISE EXCEPTION 'investment_entries has several rows for transaction_id %; resolve them before adding uq_investment_entries_transaction_id', duplicate_ids;
+    END IF;
+END $$;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_investment_entries_transaction_id
+    ON investment_entries(transaction_id);
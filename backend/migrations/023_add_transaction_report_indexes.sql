@@ -0,0 +1,23 @@
+-- Report queries (monthly trends, budget evaluation totals, category
+-- breakdown) are served by 020's (user_id, type, date) covering index, which
+-- now also includes account_id. Drop the near-duplicate indexes an earlier
+-- version of this migration added; each one cost every transaction insert.
+DROP INDEX IF EXISTS idx_transactions_user_date_type;
+DROP INDEX IF EXISTS idx_transactions_user_date_expense;
+
+-- Databases that ran 020 before account_id joined its INCLUDE list get the
+-- index rebuilt once.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM pg_indexes
+        WHERE indexname = 'idx_transactions_user_type_date'
+            AND position('account_id' IN indexdef) = 0
+    ) THEN
+        DROP INDEX idx_transactions_user_type_date;
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_transactions_user_type_date
+    ON transactions(user_id, type, date) INCLUDE (amount, category, account_id, currency);
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from calendar import monthrange
+from functools import lru_cache
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Iterable, List, Dict, Set
+from typing import Iterable, Iterator, List, Dict, FrozenSet, Set
 
 WEEKLY_DAYS = 7
 BIWEEKLY_DAYS = 14
@@ -22,8 +23,15 @@ KIND_TO_ACTUAL_TYPES = {
     "investment": {"investment"},
 }
 
+# Raw schedule strings that already passed validation, mapped to their
+# normalized form; schedules repeat a handful of spellings.
+_VALID_FREQUENCIES: Dict[str, str] = {}
+_VALID_KINDS: Dict[str, str] = {}
 
-@dataclass(frozen=True)
+_NO_DATES: FrozenSet[date] = frozenset()
+
+
+@dataclass(frozen=True, slots=True)
 class RecurringSchedule:
     amount: Decimal
     start_date: date
@@ -35,14 +43,14 @@ class RecurringSchedule:
     notes: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ActualTransaction:
     date: date
     account_id: int
     type: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProjectedEntry:
     date: date
     amount: Decimal
@@ -95,7 +103,7 @@ def _project_schedule(
     schedule: RecurringSchedule,
     range_start: date,
     range_end: date,
-    existing_index: Dict[int, Dict[str, Set[date]]],
+    existing_index: Dict[int, Dict[str, FrozenSet[date]]],
     check_range: bool = True,
 ) -> List[ProjectedEntry]:
     if check_range and range_start > range_end:
@@ -104,6 +112,8 @@ def _project_schedule(
         raise ValueError("schedule.amount must be greater than zero.")
     normalized_frequency = _validate_frequency(schedule.frequency)
     normalized_kind = _validate_kind(schedule.kind)
+    if range_end < schedule.start_date:
+        return []
 
     excluded_dates = _excluded_dates_for_schedule(schedule, normalized_kind, existing_index)
     if normalized_frequency in {"monthly", "yearly"}:
@@ -117,55 +127,78 @@ def _project_schedule(
                 schedule.start_date, range_start
             )
             month_increment = 12
+        occurrences = _monthly_occurrences(
+            schedule.start_date, first_date, month_offset, month_increment, range_end
+        )
     else:
         interval = WEEKLY_DAYS if normalized_frequency == "weekly" else BIWEEKLY_DAYS
         first_date = _first_occurrence_on_or_after(
             schedule.start_date, range_start, interval
         )
+        # Fixed-day steps are a plain ordinal stride.
+        occurrences = map(
+            date.fromordinal,
+            range(first_date.toordinal(), range_end.toordinal() + 1, interval),
+        )
 
     transaction_type, is_investment = KIND_TO_PROJECTION[normalized_kind]
-    projections: List[ProjectedEntry] = []
+    amount = _coerce_amount(schedule.amount)
+    return [
+        ProjectedEntry(
+            date=current_date,
+            amount=amount,
+            account_id=schedule.account_id,
+            transaction_type=transaction_type,
+            is_investment=is_investment,
+            notes=schedule.notes,
+        )
+        for current_date in occurrences
+        if current_date not in excluded_dates
+    ]
+
+
+def _monthly_occurrences(
+    start_date: date,
+    first_date: date,
+    month_offset: int,
+    month_increment: int,
+    range_end: date,
+) -> Iterator[date]:
     current_date = first_date
     while current_date <= range_end:
-        if current_date not in excluded_dates:
-            projections.append(
-                ProjectedEntry(
-                    date=current_date,
-                    amount=_coerce_amount(schedule.amount),
-                    account_id=schedule.account_id,
-                    transaction_type=transaction_type,
-                    is_investment=is_investment,
-                    notes=schedule.notes,
-                )
-            )
-        if normalized_frequency in {"monthly", "yearly"}:
-            month_offset += month_increment
-            current_date = _add_months(
-                schedule.start_date, month_offset, schedule.start_date.day
-            )
-        else:
-            current_date += timedelta(days=interval)
-
-    return projections
+        yield current_date
+        month_offset += month_increment
+        current_date = _add_months(start_date, month_offset, start_date.day)
 
 
 def _validate_frequency(frequency: str) -> str:
+    cached = _VALID_FREQUENCIES.get(frequency)
+    if cached is not None:
+        return cached
     normalized = _normalize_frequency(frequency)
     if normalized == "byweekly":
         normalized = "biweekly"
     if normalized not in SUPPORTED_FREQUENCIES:
         raise ValueError("Only weekly, biweekly, monthly, or yearly schedules are supported.")
+    _VALID_FREQUENCIES[frequency] = normalized
     return normalized
 
 
 def _normalize_frequency(value: str) -> str:
-    return "".join(ch for ch in value.strip().lower() if ch.isalnum())
+    normalized = value.strip().lower()
+    if normalized.isalnum():
+        return normalized
+    return "".join(ch for ch in normalized if ch.isalnum())
 
 
 def _validate_kind(kind: str) -> str:
+    cached = _VALID_KINDS.get(kind)
+    if cached is not None:
+        return cached
     normalized = _normalize_kind(kind)
     if normalized not in SUPPORTED_KINDS:
         raise ValueError("Only income, expense, or investment schedules are supported.")
+    _VALID_KINDS[kind] = normalized
     return normalized
 
 
@@ -176,13 +209,20 @@ def _normalize_kind(value: str) -> str:
 def _excluded_dates_for_schedule(
     schedule: RecurringSchedule,
     normalized_kind: str,
-    existing_index: Dict[int, Dict[str, Set[date]]],
-) -> Set[date]:
-    excluded: Set[date] = set()
-    account_index = existing_index.get(schedule.account_id, {})
-    for actual_type in KIND_TO_ACTUAL_TYPES[normalized_kind]:
-        excluded.update(account_index.get(actual_type, set()))
-    return excluded
+    existing_index: Dict[int, Dict[str, FrozenSet[date]]],
+) -> FrozenSet[date]:
+    account_index = existing_index.get(schedule.account_id)
+    if not account_index:
+        return _NO_DATES
+    actual_types = KIND_TO_ACTUAL_TYPES[normalized_kind]
+    if len(actual_types) == 1:
+        # Every kind maps to one transaction type today; share the indexed
+        # set instead of copying it per schedule.
+        (actual_type,) = actual_types
+        return account_index.get(actual_type, _NO_DATES)
+    return _NO_DATES.union(
+        *(account_index.get(actual_type, _NO_DATES) for actual_type in actual_types)
+    )
 
 
 def _first_occurrence_on_or_after(
@@ -224,20 +264,27 @@ def _add_months(start_date: date, months: int, anchor_day: int) -> date:
     total_month = start_date.month - 1 + months
     year = start_date.year + total_month // 12
     month = total_month % 12 + 1
-    last_day = monthrange(year, month)[1]
-    day = min(anchor_day, last_day)
+    day = min(anchor_day, _days_in_month(year, month))
     return date(year, month, day)
 
 
+@lru_cache(maxsize=4096)
+def _days_in_month(year: int, month: int) -> int:
+    return monthrange(year, month)[1]
+
+
 def _index_existing_transactions(
     existing_transactions: Iterable[ActualTransaction],
-) -> Dict[int, Dict[str, Set[date]]]:
+) -> Dict[int, Dict[str, FrozenSet[date]]]:
     index: Dict[int, Dict[str, Set[date]]] = {}
     for txn in existing_transactions:
         account_index = index.setdefault(txn.account_id, {})
         normalized_type = _normalize_kind(txn.type)
         account_index.setdefault(normalized_type, set()).add(txn.date)
-    return index
+    return {
+        account_id: {txn_type: frozenset(dates) for txn_type, dates in account_index.items()}
+        for account_id, account_index in index.items()
+    }
 
 
 def _coerce_amount(amount: Decimal) -> Decimal:
@@ -0,0 +1,351 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from decimal import Decimal
+
+try:
+    from fastapi.testclient import TestClient
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise unittest.SkipTest(f"API dependencies not installed: {exc}")
+
+from sqlalchemy import event, inspect, insert, select
+
+_DB_DIR = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR.name}/monetra-test.db"
+
+from backend import main  # noqa: E402
+
+
+class ApiTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.client = TestClient(main.app)
+        cls.client.__enter__()
+        cls.addClassCleanup(cls.client.__exit__, None, None, None)
+
+    def create_user(self, email: str) -> dict[str, str]:
+        response = self.client.post(
+            "/auth/signup", json={"email": email, "password": "secret"}
+        )
+        self.assertEqual(response.status_code, 200, response.text)
+        return {"x-user-id": str(response.json()["id"])}
+
+    def create_account(self, headers: dict[str, str], name: str = "Checking") -> int:
+        response = self.client.post(
+            "/accounts", json={"name": name, "type": "checking"}, headers=headers
+        )
+        self.assertEqual(response.status_code, 200, response.text)
+        return response.json()["id"]
+
+    def create_transaction(
+        self, headers: dict[str, str], account_id: int, amount: str, day: str
+    ) -> int:
+        response = self.client.post(
+            "/transactions",
+            json={
+                "account_id": account_id,
+                "amount": amount,
+                "type": "expense",
+                "category": "Groceries",
+                "date": day,
+            },
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 200, response.text)
+        return response.json()["id"]
+
+
+class ListTransactionsTests(ApiTestCase):
+    def test_lists_newest_first_and_filters_by_account(self) -> None:
+        headers = self.create_user("list-transactions@example.com")
+        checking_id = self.create_account(headers)
+        savings_id = self.create_account(headers, name="Savings")
+        older_id = self.create_transaction(headers, checking_id, "12.50", "2024-01-05")
+        newer_id = self.create_transaction(headers, checking_id, "40", "2024-02-01")
+        other_id = self.create_transaction(headers, savings_id, "7", "2024-01-20")
+
+        response = self.client.get("/transactions", headers=headers)
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertEqual(
+            [item["id"] for item in response.json()], [newer_id, other_id, older_id]
+        )
+
+        response = self.client.get(
+            "/transactions", params={"account_id": checking_id}, headers=headers
+        )
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertEqual([item["id"] for item in response.json()], [newer_id, older_id])
+
+    def test_streams_inside_a_transaction(self) -> None:
+        # psycopg2 rejects server-side cursors on AUTOCOMMIT connections.
+        headers = self.create_user("stream-transactions@example.com")
+        streamed_isolation_levels = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if context.execution_options.get("stream_results"):
+                streamed_isolation_levels.append(
+                    conn.get_execution_options().get("isolation_level")
+                )
+
+        event.listen(main.engine, "before_cursor_execute", record)
+        self.addCleanup(event.remove, main.engine, "before_cursor_execute", record)
+
+        response = self.client.get("/transactions", headers=headers)
+
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertTrue(streamed_isolation_levels)
+        self.assertNotIn("AUTOCOMMIT", streamed_isolation_levels)
+
+
+class CategoryGroupCacheTests(ApiTestCase):
+    def test_skips_store_when_invalidated_during_read(self) -> None:
+        headers = self.create_user("category-groups@example.com")
+        user_id = int(headers["x-user-id"])
+        response = self.client.post(
+            "/categories",
+            json={"name": "Brokerage", "group": "investments"},
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 200, response.text)
+
+        class InvalidatingConnection:
+            def __init__(self, conn) -> None:
+                self.conn = conn
+
+            def execute(self, *args, **kwargs):
+                result = self.conn.execute(*args, **kwargs)
+                # A write commits and invalidates while this read is in flight.
+                main.invalidate_category_groups(user_id)
+                return result
+
+        main.invalidate_category_groups(user_id)
+        with main.engine.connect() as conn:
+            groups = main.get_category_groups(InvalidatingConnection(conn), user_id)
+            self.assertEqual(groups.get("Brokerage"), "investments")
+            self.assertNotIn(user_id, main.category_group_cache)
+
+            self.assertEqual(main.get_category_groups(conn, user_id), groups)
+            self.assertIn(user_id, main.category_group_cache)
+
+
+class ListResponseCacheTests(ApiTestCase):
+    def test_write_changes_cached_investment_list(self) -> None:
+        headers = self.create_user("cached-investments@example.com")
+        first = self.client.get("/investments", headers=headers)
+        self.assertEqual(first.status_code, 200, first.text)
+        self.assertEqual(first.json(), [])
+
+        revalidated = self.client.get(
+            "/investments", headers={**headers, "if-none-match": first.headers["etag"]}
+        )
+        self.assertEqual(revalidated.status_code, 304)
+
+        response = self.client.post(
+            "/investments",
+            json={"name": "Index Fund", "asset_type": "etf"},
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 200, response.text)
+
+        second = self.client.get(
+            "/investments", headers={**headers, "if-none-match": first.headers["etag"]}
+        )
+        self.assertEqual(second.status_code, 200, second.text)
+        self.assertEqual([item["name"] for item in second.json()], ["Index Fund"])
+
+    def test_skips_store_when_invalidated_during_build(self) -> None:
+        def build() -> bytes:
+            # A write commits and invalidates while this body is being built.
+            main.invalidate_list_response("widgets", 1)
+            return b"[]"
+
+        main.cached_list_response("widgets", 1, None, build)
+        self.assertNotIn(("widgets", 1), main.list_response_cache)
+
+        main.cached_list_response("widgets", 1, None, lambda: b"[]")
+        self.assertIn(("widgets", 1), main.list_response_cache)
+
+
+class TransactionImportTests(ApiTestCase):
+    def import_rows(self, headers: dict[str, str], account_id: int, other_account_id: int):
+        return self.client.post(
+            "/transactions/import/commit",
+            json={
+                "account_id": account_id,
+                "transactions": [
+                    {
+                        "date": "2024-03-01",
+                        "description": "Salary",
+                        "amount": "-2500",
+                        "category": "Salary",
+                    },
+                    {
+                        "date": "2024-03-02",
+                        "description": "Market",
+                        "amount": "42.10",
+                        "category": "Groceries",
+                    },
+                    {
+                        "date": "2024-03-03",
+                        "description": "Fuel",
+                        "amount": "60",
+                        "category": "Transport",
+                        "account_id": other_account_id,
+                    },
+                ],
+            },
+            headers=headers,
+        )
+
+    def test_imports_rows_across_owned_accounts(self) -> None:
+        headers = self.create_user("import-owned@example.com")
+        checking_id = self.create_account(headers)
+        card_id = self.create_account(headers, name="Card")
+
+        response = self.import_rows(headers, checking_id, card_id)
+
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertEqual(response.json(), {"inserted_count": 3})
+        rows = self.client.get("/transactions", headers=headers).json()
+        self.assertEqual(
+            [(row["account_id"], row["type"], row["amount"]) for row in rows],
+            [
+                (card_id, "expense", "60.00"),
+                (checking_id, "expense", "42.10"),
+                (checking_id, "income", "2500.00"),
+            ],
+        )
+
+    def test_rejects_rows_for_another_users_account(self) -> None:
+        headers = self.create_user("import-owner@example.com")
+        checking_id = self.create_account(headers)
+        other_headers = self.create_user("import-other@example.com")
+        foreign_id = self.create_account(other_headers)
+
+        response = self.import_rows(headers, checking_id, foreign_id)
+
+        self.assertEqual(response.status_code, 404, response.text)
+        self.assertEqual(self.client.get("/transactions", headers=headers).json(), [])
+
+
+class SingleOriginCORSMiddlewareTests(unittest.TestCase):
+    ORIGIN = "http://frontend.test"
+
+    def client_for(self, response_headers: dict[str, str]) -> TestClient:
+        async def app(scope, receive, send) -> None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (name.encode("latin-1"), value.encode("latin-1"))
+                        for name, value in response_headers.items()
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+
+        return TestClient(main.SingleOriginCORSMiddleware(app, origin=self.ORIGIN))
+
+    def test_merges_origin_into_existing_vary(self) -> None:
+        client = self.client_for({"Vary": "Accept-Encoding"})
+
+        response = client.get("/", headers={"origin": self.ORIGIN})
+
+        self.assertEqual(response.headers.get_list("vary"), ["Accept-Encoding, Origin"])
+        self.assertEqual(response.headers["access-control-allow-origin"], self.ORIGIN)
+
+    def test_adds_vary_when_missing(self) -> None:
+        client = self.client_for({})
+
+        response = client.get("/", headers={"origin": self.ORIGIN})
+
+        self.assertEqual(response.headers.get_list("vary"), ["Origin"])
+
+    def test_leaves_vary_that_already_lists_origin(self) -> None:
+        client = self.client_for({"Vary": "origin, Accept"})
+
+        response = client.get("/", headers={"origin": self.ORIGIN})
+
+        self.assertEqual(response.headers.get_list("vary"), ["origin, Accept"])
+
+
+class ValidationErrorResponseTests(ApiTestCase):
+    def test_budget_rule_validator_errors_are_plain_400s(self) -> None:
+        headers = self.create_user("budget-rule-errors@example.com")
+
+        response = self.client.post(
+            "/budget/rules",
+            json={"rule_type": "category_cap", "amount": "100"},
+            headers=headers,
+        )
+
+        self.assertEqual(response.status_code, 400, response.text)
+        self.assertEqual(response.json(), {"detail": "Category cap requires a category."})
+
+    def test_other_validation_errors_keep_422(self) -> None:
+        headers = self.create_user("validation-errors@example.com")
+
+        budget_response = self.client.post(
+            "/budget/rules", json={"rule_type": "savings_target"}, headers=headers
+        )
+        transaction_response = self.client.post(
+            "/transactions",
+            json={"account_id": 1, "amount": "5", "type": "expense", "date": "not-a-date"},
+            headers=headers,
+        )
+
+        self.assertEqual(budget_response.status_code, 422, budget_response.text)
+        self.assertEqual(transaction_response.status_code, 422, transaction_response.text)
+        self.assertIsInstance(transaction_response.json()["detail"], list)
+
+
+class InvestmentEntryIndexTests(ApiTestCase):
+    def index_names(self) -> set[str]:
+        return {index["name"] for index in inspect(main.engine).get_indexes("investment_entries")}
+
+    def test_init_db_refuses_unique_index_over_duplicate_entries(self) -> None:
+        headers = self.create_user("duplicate-entries@example.com")
+        user_id = int(headers["x-user-id"])
+        account_id = self.create_account(headers)
+        transaction_id = self.create_transaction(headers, account_id, "100", "2024-04-01")
+        investment_id = self.client.post(
+            "/investments", json={"name": "Dup Fund", "asset_type": "etf"}, headers=headers
+        ).json()["id"]
+        entry = {
+            "user_id": user_id,
+            "investment_id": investment_id,
+            "transaction_id": transaction_id,
+            "quantity": Decimal("2"),
+            "price": Decimal("50"),
+            "type": "buy",
+            "date": date(2024, 4, 1),
+        }
+        entries = main.investment_entries
+
+        with main.engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX uq_investment_entries_transaction_id")
+            first_id = conn.execute(insert(entries).values(entry)).inserted_primary_key[0]
+            second_id = conn.execute(insert(entries).values(entry)).inserted_primary_key[0]
+
+        with self.assertRaisesRegex(RuntimeError, rf"transaction_id {transaction_id}\b"):
+            main.init_db()
+
+        self.assertNotIn("uq_investment_entries_transaction_id", self.index_names())
+        with main.engine.connect() as conn:
+            entry_ids = conn.execute(
+                select(entries.c.id)
+                .where(entries.c.transaction_id == transaction_id)
+                .order_by(entries.c.id)
+            ).scalars().all()
+        self.assertEqual(entry_ids, [first_id, second_id])
+
+        with main.engine.begin() as conn:
+            conn.execute(entries.delete().where(entries.c.id == second_id))
+        main.init_db()
+        self.assertIn("uq_investment_entries_transaction_id", self.index_names())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,13 @@ import unittest
 from datetime import date
 from decimal import Decimal
 
-from backend.budget_engine import BudgetRule, Transaction, evaluate_budget
+from backend.budget_engine import (
+    BudgetRule,
+    BudgetTotals,
+    Transaction,
+    evaluate_budget,
+    evaluate_budget_totals,
+)
 
 
 class BudgetEngineTests(unittest.TestCase):
@@ -121,6 +127,33 @@ class BudgetEngineTests(unittest.TestCase):
         self.assertEqual(result.remaining, Decimal("-100"))
         self.assertEqual(result.status, "met")
 
+    def test_totals_accumulate_streamed_rows(self) -> None:
+        totals = BudgetTotals()
+        totals.add("expense", Decimal("30"), "Food", 1)
+        totals.add(" Expense ", Decimal("45"), "Food", 2)
+        totals.add("income", Decimal("200"), None, 1)
+        totals.add("investment", Decimal("500"), "Stocks", 1)
+
+        category_result = evaluate_budget_totals(
+            totals,
+            BudgetRule(rule_type="category_cap", amount=Decimal("50"), category="Food"),
+        )
+        account_result = evaluate_budget_totals(
+            totals,
+            BudgetRule(rule_type="account_cap", amount=Decimal("50"), account_id=2),
+        )
+        savings_result = evaluate_budget_totals(
+            totals,
+            BudgetRule(rule_type="savings_target", amount=Decimal("100")),
+        )
+
+        self.assertEqual(category_result.current_value, Decimal("75"))
+        self.assertEqual(category_result.status, "over")
+        self.assertEqual(account_result.current_value, Decimal("45"))
+        self.assertEqual(account_result.remaining, Decimal("5"))
+        self.assertEqual(savings_result.current_value, Decimal("125"))
+        self.assertEqual(savings_result.status, "met")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -9,142 +9,172 @@ from backend.income_projection import (
     project_income,
 )
 
+BIWEEKLY_AMOUNT = Decimal(1500)
+LATE_START_AMOUNT = Decimal(2000)
+WEEKLY_AMOUNT = Decimal(850)
+MONTHLY_AMOUNT = Decimal(3000)
+QUARTERLY_AMOUNT = Decimal(1200)
+
+JAN_1 = date(2024, 1, 1)
+JAN_3 = date(2024, 1, 3)
+JAN_5 = date(2024, 1, 5)
+JAN_10 = date(2024, 1, 10)
+JAN_17 = date(2024, 1, 17)
+JAN_19 = date(2024, 1, 19)
+JAN_20 = date(2024, 1, 20)
+JAN_31 = date(2024, 1, 31)
+FEB_1 = date(2024, 2, 1)
+FEB_2 = date(2024, 2, 2)
+FEB_15 = date(2024, 2, 15)
+FEB_28 = date(2024, 2, 28)
+FEB_29 = date(2024, 2, 29)
+MAR_1 = date(2024, 3, 1)
+MAR_31 = date(2024, 3, 31)
+APR_1 = date(2024, 4, 1)
+APR_30 = date(2024, 4, 30)
+
+BIWEEKLY_EXPECTED = [
+    ProjectedIncome(
+        date=JAN_5,
+        amount=BIWEEKLY_AMOUNT,
+        account_id=10,
+    ),
+    ProjectedIncome(
+        date=FEB_2,
+        amount=BIWEEKLY_AMOUNT,
+        account_id=10,
+    ),
+]
+WEEKLY_EXPECTED = [
+    ProjectedIncome(
+        date=JAN_3,
+        amount=WEEKLY_AMOUNT,
+        account_id=4,
+    ),
+    ProjectedIncome(
+        date=JAN_10,
+        amount=WEEKLY_AMOUNT,
+        account_id=4,
+    ),
+    ProjectedIncome(
+        date=JAN_17,
+        amount=WEEKLY_AMOUNT,
+        account_id=4,
+    ),
+]
+MONTHLY_EXPECTED = [
+    ProjectedIncome(
+        date=FEB_29,
+        amount=MONTHLY_AMOUNT,
+        account_id=9,
+    ),
+    ProjectedIncome(
+        date=MAR_31,
+        amount=MONTHLY_AMOUNT,
+        account_id=9,
+    ),
+    ProjectedIncome(
+        date=APR_30,
+        amount=MONTHLY_AMOUNT,
+        account_id=9,
+    ),
+]
+
 
 class IncomeProjectionTests(unittest.TestCase):
-    def test_projects_biweekly_dates_and_excludes_existing(self) -> None:
-        schedule = RecurringSchedule(
-            amount=Decimal("1500"),
-            start_date=date(2024, 1, 5),
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.biweekly_schedule = RecurringSchedule(
+            amount=BIWEEKLY_AMOUNT,
+            start_date=JAN_5,
             account_id=10,
             frequency="bi-weekly",
         )
-        existing = [
+        cls.biweekly_existing = (
             IncomeTransaction(
-                date=date(2024, 1, 19),
-                amount=Decimal("1500"),
-                account_id=10,
-            )
-        ]
-
-        projections = project_income(
-            schedule,
-            range_start=date(2024, 1, 1),
-            range_end=date(2024, 2, 15),
-            existing_income=existing,
-        )
-
-        expected = [
-            ProjectedIncome(
-                date=date(2024, 1, 5),
-                amount=Decimal("1500"),
+                date=JAN_19,
+                amount=BIWEEKLY_AMOUNT,
                 account_id=10,
             ),
-            ProjectedIncome(
-                date=date(2024, 2, 2),
-                amount=Decimal("1500"),
-                account_id=10,
-            ),
-        ]
-        self.assertEqual(projections, expected)
-
-    def test_returns_empty_when_range_before_start_date(self) -> None:
-        schedule = RecurringSchedule(
-            amount=Decimal("2000"),
-            start_date=date(2024, 3, 1),
+        )
+        cls.late_start_schedule = RecurringSchedule(
+            amount=LATE_START_AMOUNT,
+            start_date=MAR_1,
             account_id=7,
             frequency="biweekly",
         )
-
-        projections = project_income(
-            schedule,
-            range_start=date(2024, 2, 1),
-            range_end=date(2024, 2, 28),
-            existing_income=[],
-        )
-
-        self.assertEqual(projections, [])
-
-    def test_projects_weekly_dates(self) -> None:
-        schedule = RecurringSchedule(
-            amount=Decimal("850"),
-            start_date=date(2024, 1, 3),
+        cls.weekly_schedule = RecurringSchedule(
+            amount=WEEKLY_AMOUNT,
+            start_date=JAN_3,
             account_id=4,
             frequency="weekly",
         )
-
-        projections = project_income(
-            schedule,
-            range_start=date(2024, 1, 1),
-            range_end=date(2024, 1, 20),
-            existing_income=[],
+        cls.monthly_schedule = RecurringSchedule(
+            amount=MONTHLY_AMOUNT,
+            start_date=JAN_31,
+            account_id=9,
+            frequency="monthly",
+        )
+        cls.quarterly_schedule = RecurringSchedule(
+            amount=QUARTERLY_AMOUNT,
+            start_date=APR_1,
+            account_id=3,
+            frequency="quarterly",
         )
 
-        expected = [
-            ProjectedIncome(
-                date=date(2024, 1, 3),
-                amount=Decimal("850"),
-                account_id=4,
+    def test_projects_each_frequency(self) -> None:
+        cases = (
+            (
+                "bi-weekly, excluding existing income",
+                self.biweekly_schedule,
+                JAN_1,
+                FEB_15,
+                self.biweekly_existing,
+                BIWEEKLY_EXPECTED,
             ),
-            ProjectedIncome(
-                date=date(2024, 1, 10),
-                amount=Decimal("850"),
-                account_id=4,
+            (
+                "weekly",
+                self.weekly_schedule,
+                JAN_1,
+                JAN_20,
+                (),
+                WEEKLY_EXPECTED,
             ),
-            ProjectedIncome(
-                date=date(2024, 1, 17),
-                amount=Decimal("850"),
-                account_id=4,
+            (
+                "monthly with day clamp",
+                self.monthly_schedule,
+                FEB_1,
+                APR_30,
+                (),
+                MONTHLY_EXPECTED,
             ),
-        ]
-        self.assertEqual(projections, expected)
-
-    def test_projects_monthly_dates_with_day_clamp(self) -> None:
-        schedule = RecurringSchedule(
-            amount=Decimal("3000"),
-            start_date=date(2024, 1, 31),
-            account_id=9,
-            frequency="monthly",
         )
+        for name, schedule, range_start, range_end, existing, expected in cases:
+            with self.subTest(name):
+                projections = project_income(
+                    schedule,
+                    range_start=range_start,
+                    range_end=range_end,
+                    existing_income=existing,
+                )
+                self.assertEqual(projections, expected)
 
+    def test_returns_empty_when_range_before_start_date(self) -> None:
         projections = project_income(
-            schedule,
-            range_start=date(2024, 2, 1),
-            range_end=date(2024, 4, 30),
+            self.late_start_schedule,
+            range_start=FEB_1,
+            range_end=FEB_28,
             existing_income=[],
         )
 
-        expected = [
-            ProjectedIncome(
-                date=date(2024, 2, 29),
-                amount=Decimal("3000"),
-                account_id=9,
-            ),
-            ProjectedIncome(
-                date=date(2024, 3, 31),
-                amount=Decimal("3000"),
-                account_id=9,
-            ),
-            ProjectedIncome(
-                date=date(2024, 4, 30),
-                amount=Decimal("3000"),
-                account_id=9,
-            ),
-        ]
-        self.assertEqual(projections, expected)
+        self.assertEqual(projections, [])
 
     def test_rejects_unsupported_frequency(self) -> None:
-        schedule = RecurringSchedule(
-            amount=Decimal("1200"),
-            start_date=date(2024, 4, 1),
-            account_id=3,
-            frequency="quarterly",
-        )
-
         with self.assertRaises(ValueError):
             project_income(
-                schedule,
-                range_start=date(2024, 4, 1),
-                range_end=date(2024, 4, 30),
+                self.quarterly_schedule,
+                range_start=APR_1,
+                range_end=APR_30,
                 existing_income=[],
             )
 
@@ -9,145 +9,172 @@ from backend.recurring_projection import (
     project_recurring_schedule,
 )
 
+WEEKLY_EXPENSE_AMOUNT = Decimal(120)
+INVESTMENT_AMOUNT = Decimal(500)
+YEARLY_AMOUNT = Decimal(75)
+GYM_AMOUNT = Decimal(45)
+
+JAN_1 = date(2024, 1, 1)
+JAN_5 = date(2024, 1, 5)
+JAN_8 = date(2024, 1, 8)
+JAN_15 = date(2024, 1, 15)
+JAN_19 = date(2024, 1, 19)
+JAN_20 = date(2024, 1, 20)
+FEB_2 = date(2024, 2, 2)
+FEB_10 = date(2024, 2, 10)
+FEB_29 = date(2024, 2, 29)
+MAY_1 = date(2024, 5, 1)
+MAY_31 = date(2024, 5, 31)
+FEB_28_2025 = date(2025, 2, 28)
+FEB_28_2026 = date(2026, 2, 28)
+MAR_1_2026 = date(2026, 3, 1)
+
+WEEKLY_EXPENSE_EXPECTED = [
+    ProjectedEntry(
+        date=JAN_1,
+        amount=WEEKLY_EXPENSE_AMOUNT,
+        account_id=2,
+        transaction_type="expense",
+        is_investment=False,
+    ),
+    ProjectedEntry(
+        date=JAN_15,
+        amount=WEEKLY_EXPENSE_AMOUNT,
+        account_id=2,
+        transaction_type="expense",
+        is_investment=False,
+    ),
+]
+INVESTMENT_EXPECTED = [
+    ProjectedEntry(
+        date=JAN_5,
+        amount=INVESTMENT_AMOUNT,
+        account_id=9,
+        transaction_type="expense",
+        is_investment=True,
+    ),
+    ProjectedEntry(
+        date=FEB_2,
+        amount=INVESTMENT_AMOUNT,
+        account_id=9,
+        transaction_type="expense",
+        is_investment=True,
+    ),
+]
+YEARLY_EXPECTED = [
+    ProjectedEntry(
+        date=FEB_29,
+        amount=YEARLY_AMOUNT,
+        account_id=4,
+        transaction_type="expense",
+        is_investment=False,
+    ),
+    ProjectedEntry(
+        date=FEB_28_2025,
+        amount=YEARLY_AMOUNT,
+        account_id=4,
+        transaction_type="expense",
+        is_investment=False,
+    ),
+    ProjectedEntry(
+        date=FEB_28_2026,
+        amount=YEARLY_AMOUNT,
+        account_id=4,
+        transaction_type="expense",
+        is_investment=False,
+    ),
+]
+
 
 class RecurringProjectionTests(unittest.TestCase):
-    def test_projects_expense_schedule_and_excludes_actuals(self) -> None:
-        schedule = RecurringSchedule(
-            amount=Decimal("120"),
-            start_date=date(2024, 1, 1),
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.weekly_expense_schedule = RecurringSchedule(
+            amount=WEEKLY_EXPENSE_AMOUNT,
+            start_date=JAN_1,
             account_id=2,
             frequency="weekly",
             kind="expense",
         )
-        existing = [
+        cls.weekly_expense_existing = (
             ActualTransaction(
-                date=date(2024, 1, 8),
+                date=JAN_8,
                 account_id=2,
                 type="expense",
-            )
-        ]
-
-        projections = project_recurring_schedule(
-            schedule,
-            range_start=date(2024, 1, 1),
-            range_end=date(2024, 1, 20),
-            existing_transactions=existing,
-        )
-
-        expected = [
-            ProjectedEntry(
-                date=date(2024, 1, 1),
-                amount=Decimal("120"),
-                account_id=2,
-                transaction_type="expense",
-                is_investment=False,
-            ),
-            ProjectedEntry(
-                date=date(2024, 1, 15),
-                amount=Decimal("120"),
-                account_id=2,
-                transaction_type="expense",
-                is_investment=False,
             ),
-        ]
-        self.assertEqual(projections, expected)
-
-    def test_projects_investment_schedule_as_expense_with_flag(self) -> None:
-        schedule = RecurringSchedule(
-            amount=Decimal("500"),
-            start_date=date(2024, 1, 5),
+        )
+        cls.investment_schedule = RecurringSchedule(
+            amount=INVESTMENT_AMOUNT,
+            start_date=JAN_5,
             account_id=9,
             frequency="biweekly",
             kind="investment",
         )
-        existing = [
+        cls.investment_existing = (
             ActualTransaction(
-                date=date(2024, 1, 19),
+                date=JAN_19,
                 account_id=9,
                 type="investment",
-            )
-        ]
-
-        projections = project_recurring_schedule(
-            schedule,
-            range_start=date(2024, 1, 1),
-            range_end=date(2024, 2, 10),
-            existing_transactions=existing,
-        )
-
-        expected = [
-            ProjectedEntry(
-                date=date(2024, 1, 5),
-                amount=Decimal("500"),
-                account_id=9,
-                transaction_type="expense",
-                is_investment=True,
-            ),
-            ProjectedEntry(
-                date=date(2024, 2, 2),
-                amount=Decimal("500"),
-                account_id=9,
-                transaction_type="expense",
-                is_investment=True,
             ),
-        ]
-        self.assertEqual(projections, expected)
-
-    def test_projects_yearly_schedule_with_day_clamp(self) -> None:
-        schedule = RecurringSchedule(
-            amount=Decimal("75"),
-            start_date=date(2024, 2, 29),
+        )
+        cls.yearly_schedule = RecurringSchedule(
+            amount=YEARLY_AMOUNT,
+            start_date=FEB_29,
             account_id=4,
             frequency="yearly",
             kind="expense",
         )
-
-        projections = project_recurring_schedule(
-            schedule,
-            range_start=date(2024, 1, 1),
-            range_end=date(2026, 3, 1),
-            existing_transactions=[],
+        cls.gym_schedule = RecurringSchedule(
+            amount=GYM_AMOUNT,
+            start_date=MAY_1,
+            account_id=7,
+            frequency="monthly",
+            kind="expense",
+            notes="Gym membership",
         )
 
-        expected = [
-            ProjectedEntry(
-                date=date(2024, 2, 29),
-                amount=Decimal("75"),
-                account_id=4,
-                transaction_type="expense",
-                is_investment=False,
+    def test_projects_each_schedule_kind(self) -> None:
+        cases = (
+            (
+                "weekly expense, excluding actuals",
+                self.weekly_expense_schedule,
+                JAN_1,
+                JAN_20,
+                self.weekly_expense_existing,
+                WEEKLY_EXPENSE_EXPECTED,
             ),
-            ProjectedEntry(
-                date=date(2025, 2, 28),
-                amount=Decimal("75"),
-                account_id=4,
-                transaction_type="expense",
-                is_investment=False,
+            (
+                "bi-weekly investment as flagged expense",
+                self.investment_schedule,
+                JAN_1,
+                FEB_10,
+                self.investment_existing,
+                INVESTMENT_EXPECTED,
             ),
-            ProjectedEntry(
-                date=date(2026, 2, 28),
-                amount=Decimal("75"),
-                account_id=4,
-                transaction_type="expense",
-                is_investment=False,
+            (
+                "yearly with day clamp",
+                self.yearly_schedule,
+                JAN_1,
+                MAR_1_2026,
+                (),
+                YEARLY_EXPECTED,
             ),
-        ]
-        self.assertEqual(projections, expected)
-
-    def test_projects_notes_on_schedule(self) -> None:
-        schedule = RecurringSchedule(
-            amount=Decimal("45"),
-            start_date=date(2024, 5, 1),
-            account_id=7,
-            frequency="monthly",
-            kind="expense",
-            notes="Gym membership",
         )
+        for name, schedule, range_start, range_end, existing, expected in cases:
+            with self.subTest(name):
+                projections = project_recurring_schedule(
+                    schedule,
+                    range_start=range_start,
+                    range_end=range_end,
+                    existing_transactions=existing,
+                )
+                self.assertEqual(projections, expected)
 
+    def test_projects_notes_on_schedule(self) -> None:
         projections = project_recurring_schedule(
-            schedule,
-            range_start=date(2024, 5, 1),
-            range_end=date(2024, 5, 31),
+            self.gym_schedule,
+            range_start=MAY_1,
+            range_end=MAY_31,
             existing_transactions=[],
         )
 
@@ -155,8 +182,8 @@ class RecurringProjectionTests(unittest.TestCase):
             projections,
             [
                 ProjectedEntry(
-                    date=date(2024, 5, 1),
-                    amount=Decimal("45"),
+                    date=MAY_1,
+                    amount=GYM_AMOUNT,
                     account_id=7,
                     transaction_type="expense",
                     is_investment=False,